@@ -35,8 +35,9 @@ def create_clean_trade_chart(symbol='AAPL'):
     from config import BX_TRENDER_PARAMS
     
     dh = DataHandler()
-    weekly = dh.get_data(symbol, period='10y', interval='1wk')
-    monthly = dh.get_data(symbol, period='10y', interval='1mo')
+    timeframes = dh.get_timeframes(symbol, {'1wk': '10y', '1mo': '10y'})
+    weekly = timeframes['1wk']
+    monthly = timeframes['1mo']
     
     weekly_bx = calculate_bxtrender(weekly, **BX_TRENDER_PARAMS)
     monthly_bx = calculate_bxtrender(monthly, **BX_TRENDER_PARAMS)
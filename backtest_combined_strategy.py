@@ -32,9 +32,12 @@ from plotly.subplots import make_subplots
 import warnings
 warnings.filterwarnings('ignore')
 
+from data.alignment import TimeframeAlignment
 from data.data_handler import DataHandler
 from indicators.bxtrender import calculate_bxtrender
-from indicators.fair_value_bands import calculate_fair_value_bands, FAIR_VALUE_PARAMS
+from indicators.fair_value_bands import (
+    calculate_fair_value_bands, point_in_time_fair_value_bands, FAIR_VALUE_PARAMS
+)
 from config import BX_TRENDER_PARAMS
 
 
@@ -120,10 +123,16 @@ def run_backtest(symbol='AAPL',
                  daily_period='max',
                  weekly_period='10y',
                  monthly_period='10y',
-                 starting_capital=10000):
+                 starting_capital=10000,
+                 point_in_time=False):
     """
     Run comprehensive backtest of combined strategy.
     
+    Args:
+        point_in_time: Compare closes with the Fair Value Bands as they were
+                       known at each bar (deviation pivots only count once
+                       confirmed) instead of the full-history bands
+    
     Returns:
         tuple: (figure, trades, statistics)
     """
@@ -139,13 +148,18 @@ def run_backtest(symbol='AAPL',
     
     data_handler = DataHandler()
     
-    daily_data = data_handler.get_data(symbol, period=daily_period, interval='1d')
+    # One daily download; weekly and monthly bars are resampled from it
+    timeframes = data_handler.get_timeframes(
+        symbol, {'1d': daily_period, '1wk': weekly_period, '1mo': monthly_period}
+    )
+    
+    daily_data = timeframes['1d']
     print(f"✓ Loaded {len(daily_data)} daily bars")
     
-    weekly_data = data_handler.get_data(symbol, period=weekly_period, interval='1wk')
+    weekly_data = timeframes['1wk']
     print(f"✓ Loaded {len(weekly_data)} weekly bars")
     
-    monthly_data = data_handler.get_data(symbol, period=monthly_period, interval='1mo')
+    monthly_data = timeframes['1mo']
     print(f"✓ Loaded {len(monthly_data)} monthly bars")
     
     # ========================================================================
@@ -155,10 +169,11 @@ def run_backtest(symbol='AAPL',
     
     weekly_bx = calculate_bxtrender(weekly_data, **BX_TRENDER_PARAMS)
     monthly_bx = calculate_bxtrender(monthly_data, **BX_TRENDER_PARAMS)
-    daily_fvb = calculate_fair_value_bands(daily_data, **FAIR_VALUE_PARAMS)
-    weekly_fvb = calculate_fair_value_bands(weekly_data, **FAIR_VALUE_PARAMS)
+    fair_value_bands = point_in_time_fair_value_bands if point_in_time else calculate_fair_value_bands
+    daily_fvb = fair_value_bands(daily_data, **FAIR_VALUE_PARAMS)
+    weekly_fvb = fair_value_bands(weekly_data, **FAIR_VALUE_PARAMS)
     
-    print("✓ All indicators calculated")
+    print("✓ All indicators calculated" + (" (point-in-time bands)" if point_in_time else ""))
     
     # ========================================================================
     # STEP 3: Generate Entry Signals
@@ -167,6 +182,9 @@ def run_backtest(symbol='AAPL',
     
     entry_signals = []
     
+    # Weekly bar positions are found by binary search instead of index masks
+    alignment = TimeframeAlignment(timeframes)
+    
     # Find favorable monthly closes
     for i in range(1, len(monthly_bx)):
         bx_value = monthly_bx['short_term_xtrender'].iloc[i]
@@ -182,13 +200,11 @@ def run_backtest(symbol='AAPL',
                 next_monthly_date = weekly_bx.index[-1]
             
             # Find weekly signals in NEXT month (use >= to include first weekly bar)
-            weekly_in_range = weekly_bx[
-                (weekly_bx.index >= next_monthly_date) & 
-                (weekly_bx.index < (monthly_bx.index[i + 2] if i + 2 < len(monthly_bx) else next_monthly_date + pd.DateOffset(months=1)))
-            ]
+            month_after = (monthly_bx.index[i + 2] if i + 2 < len(monthly_bx)
+                           else next_monthly_date + pd.DateOffset(months=1))
             
-            for weekly_date in weekly_in_range.index:
-                weekly_idx = weekly_bx.index.get_loc(weekly_date)
+            for weekly_idx in alignment.between('1wk', next_monthly_date, month_after):
+                weekly_date = weekly_bx.index[weekly_idx]
                 
                 if weekly_idx > 0:
                     weekly_bx_value = weekly_bx['short_term_xtrender'].iloc[weekly_idx]
@@ -35,9 +35,10 @@ def create_trades_only_chart(symbol='AAPL'):
     from config import BX_TRENDER_PARAMS
     
     dh = DataHandler()
-    daily = dh.get_data(symbol, period='max', interval='1d')
-    weekly = dh.get_data(symbol, period='10y', interval='1wk')
-    monthly = dh.get_data(symbol, period='10y', interval='1mo')
+    timeframes = dh.get_timeframes(symbol, {'1d': 'max', '1wk': '10y', '1mo': '10y'})
+    daily = timeframes['1d']
+    weekly = timeframes['1wk']
+    monthly = timeframes['1mo']
     
     daily_fvb = calculate_fair_value_bands(daily, **FAIR_VALUE_PARAMS)
     weekly_fvb = calculate_fair_value_bands(weekly, **FAIR_VALUE_PARAMS)
@@ -42,11 +42,20 @@ warnings.filterwarnings('ignore')
 
 # Import our custom modules
 from data.data_handler import get_sample_data, DataHandler
-from indicators.bxtrender import calculate_bxtrender
+from indicators.bxtrender import BXtrender, calculate_bxtrender
 from indicators.fair_value_bands import calculate_fair_value_bands, FAIR_VALUE_PARAMS
 from config import BX_TRENDER_PARAMS, DATA_PARAMS
 
 
+def _timeframe_interval(timeframe):
+    """Map a timeframe name ('weekly', 'monthly') to its data interval."""
+    if timeframe == 'weekly':
+        return '1wk'
+    elif timeframe == 'monthly':
+        return '1mo'
+    return '1d'  # fallback
+
+
 def create_bxtrender_multi_timeframe(symbol='AAPL', periods={'weekly': '5y', 'monthly': '10y'}, save_html=False):
     """
     Create B-Xtrender multi-timeframe visualization with entry signals.
@@ -86,26 +95,17 @@ def create_bxtrender_multi_timeframe(symbol='AAPL', periods={'weekly': '5y', 'mo
     results = {}
     timeframes = {}
 
-    # Fetch and calculate for each timeframe
+    # One daily download; every timeframe is resampled from it
+    data_handler = DataHandler()
+    frames = data_handler.get_timeframes(
+        symbol, {_timeframe_interval(tf): period for tf, period in periods.items()}
+    )
+
+    # Calculate for each timeframe
     for timeframe, period in periods.items():
         print(f"Loading {timeframe} data ({period})...")
 
-        # Get data handler instance
-        data_handler = DataHandler()
-
-        if timeframe == 'weekly':
-            interval = '1wk'
-        elif timeframe == 'monthly':
-            interval = '1mo'
-        else:
-            interval = '1d'  # fallback
-
-        # Fetch data
-        data = data_handler.get_data(
-            symbol,
-            period=period,
-            interval=interval
-        )
+        data = frames[_timeframe_interval(timeframe)]
 
         if data is None or data.empty:
             print(f"No {timeframe} data available")
@@ -547,17 +547,14 @@ def get_bxtrender_multitimeframe_data(symbol='AAPL', periods={'weekly': '2y', 'm
     """
     results = {}
 
-    for timeframe, period in periods.items():
-        data_handler = DataHandler()
-
-        if timeframe == 'weekly':
-            interval = '1wk'
-        elif timeframe == 'monthly':
-            interval = '1mo'
-        else:
-            interval = '1d'
+    data_handler = DataHandler()
+    frames = data_handler.get_timeframes(
+        symbol, {_timeframe_interval(tf): period for tf, period in periods.items()},
+        columns=BXtrender.INPUT_COLUMNS
+    )
 
-        data = data_handler.get_data(symbol, period=period, interval=interval)
+    for timeframe in periods:
+        data = frames[_timeframe_interval(timeframe)]
         if data is not None:
             result = calculate_bxtrender(data, **BX_TRENDER_PARAMS)
             results[timeframe] = result['short_term_xtrender']
@@ -36,6 +36,7 @@ from plotly.subplots import make_subplots
 import warnings
 warnings.filterwarnings('ignore')
 
+from data.alignment import TimeframeAlignment
 from data.data_handler import DataHandler
 from indicators.bxtrender import calculate_bxtrender
 from indicators.fair_value_bands import calculate_fair_value_bands, FAIR_VALUE_PARAMS
@@ -69,9 +70,14 @@ def generate_combined_signals(symbol='AAPL',
     
     data_handler = DataHandler()
     
+    # One daily download; weekly and monthly bars are resampled from it
+    timeframes = data_handler.get_timeframes(
+        symbol, {'1d': 'max', '1wk': weekly_period, '1mo': monthly_period}
+    )
+    
     # Daily data (for Fair Value Bands exits)
     # Load MAX historical data for proper band calculation
-    daily_data = data_handler.get_data(symbol, period='max', interval='1d')
+    daily_data = timeframes['1d']
     print(f"✓ Loaded {len(daily_data)} daily bars (max history for proper FVB calculation)")
     
     # Trim to last 10 years for display
@@ -79,11 +85,11 @@ def generate_combined_signals(symbol='AAPL',
     daily_data_display_start = ten_years_ago
     
     # Weekly data (for B-Xtrender signals + FVB 50% exits)
-    weekly_data = data_handler.get_data(symbol, period=weekly_period, interval='1wk')
+    weekly_data = timeframes['1wk']
     print(f"✓ Loaded {len(weekly_data)} weekly bars")
     
     # Monthly data (for B-Xtrender confirmation)
-    monthly_data = data_handler.get_data(symbol, period=monthly_period, interval='1mo')
+    monthly_data = timeframes['1mo']
     print(f"✓ Loaded {len(monthly_data)} monthly bars")
     
     # ========================================================================
@@ -116,6 +122,9 @@ def generate_combined_signals(symbol='AAPL',
     
     entry_signals = []
     
+    # Weekly bar positions are found by binary search instead of index masks
+    alignment = TimeframeAlignment(timeframes)
+    
     # Find favorable monthly closes (light colors = increasing)
     favorable_monthly = []
     
@@ -132,6 +141,7 @@ def generate_combined_signals(symbol='AAPL',
         
         if is_light:
             favorable_monthly.append({
+                'monthly_idx': i,
                 'monthly_close_date': date,
                 'bx_value': bx_value,
                 'is_green': bx_value > 0
@@ -144,7 +154,7 @@ def generate_combined_signals(symbol='AAPL',
         monthly_close_date = monthly_info['monthly_close_date']
         
         # Find the next monthly close date for the range
-        monthly_idx = monthly_bx.index.get_loc(monthly_close_date)
+        monthly_idx = monthly_info['monthly_idx']
         if monthly_idx + 1 < len(monthly_bx):
             next_monthly_date = monthly_bx.index[monthly_idx + 1]
         else:
@@ -152,14 +162,12 @@ def generate_combined_signals(symbol='AAPL',
             next_monthly_date = weekly_bx.index[-1]
         
         # Find weekly bars in the NEXT month (after monthly confirmation)
-        weekly_in_range = weekly_bx[
-            (weekly_bx.index > monthly_close_date) & 
-            (weekly_bx.index <= next_monthly_date)
-        ]
+        weekly_in_range = alignment.between('1wk', monthly_close_date, next_monthly_date,
+                                            include_lower=False, include_upper=True)
         
         # Check each weekly bar for light color close
-        for weekly_date in weekly_in_range.index:
-            weekly_idx = weekly_bx.index.get_loc(weekly_date)
+        for weekly_idx in weekly_in_range:
+            weekly_date = weekly_bx.index[weekly_idx]
             
             if weekly_idx > 0:
                 weekly_bx_value = weekly_bx['short_term_xtrender'].iloc[weekly_idx]
@@ -480,7 +488,7 @@ def generate_combined_signals(symbol='AAPL',
         entry_bx_values = []
         entry_dates = []
         for signal in entry_signals:
-            idx = weekly_bx.index.get_loc(signal['date'])
+            idx = alignment.position('1wk', signal['date'])
             entry_bx_values.append(weekly_bx['short_term_xtrender'].iloc[idx])
             entry_dates.append(signal['date'])
         
@@ -506,7 +514,7 @@ def generate_combined_signals(symbol='AAPL',
         sl_bx_values = []
         sl_dates = []
         for signal in stop_loss_signals:
-            idx = weekly_bx.index.get_loc(signal['date'])
+            idx = alignment.position('1wk', signal['date'])
             sl_bx_values.append(weekly_bx['short_term_xtrender'].iloc[idx])
             sl_dates.append(signal['date'])
         
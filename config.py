@@ -63,6 +63,7 @@ BX_TRENDER_PARAMS = {
 FAIR_VALUE_PARAMS = {
     # Fair Value Basis Settings
     'smoothing_type': 'SMA',  # Smoothing method: SMA, EMA, HMA, RMA, WMA, VWMA, Median, VWAP
+                              # (SMA_exact: SMA that FairValueBandsState streams bit for bit)
     'length': 33,             # Smoothing period
     'source_str': 'OHLC4',    # Price source for fair value
     
@@ -79,7 +80,15 @@ FAIR_VALUE_PARAMS = {
     'vwap_anchor': '1D',      # VWAP anchor timeframe
     
     # Trend Mode
-    'trend_mode': 'Cross'     # 'Cross' or 'Direction'
+    'trend_mode': 'Cross',    # 'Cross' or 'Direction'
+    
+    # Deviation Pivot Settings
+    'pivot_left': 5,          # Bars left of a pivot it must be >= (or <=)
+    'pivot_right': 5,         # Bars right of a pivot (confirmation delay)
+    'pivot_mode': 'centered'  # 'centered': a pivot counts from its own bar (uses the
+                              #   pivot_right bars after it, i.e. looks ahead)
+                              # 'causal': a pivot counts from the bar that confirms it,
+                              #   like PineScript ta.pivothigh (no lookahead)
 }
 
 # ============================================================================
@@ -103,6 +112,58 @@ DATA_PARAMS = {
     
     'start_date': '2023-01-01',  # Optional: specific start date (YYYY-MM-DD)
     'end_date': None,            # Optional: specific end date (None = today)
+
+    'cache_dir': '.ohlcv_cache', # Persistent Parquet cache for downloaded history
+                                 # Later runs only download bars newer than the cache
+                                 # Set to None to always download the full history
+    'calendar': 'NYSE',          # Exchange calendar for cache freshness: cached bars
+                                 # written after the last session closed are reused
+                                 # without a download ('' = always refresh the tail)
+
+    'memory_cache_mb': 256,      # In-process LRU budget for prepared frames (MB)
+                                 # Repeated requests in one run are served from memory
+    'memory_cache_ttl': 300,     # Seconds a frame is served from memory before the
+                                 # calendar decides whether its bars are still final
+                                 # (None = keep until evicted)
+
+    'batch_size': 50,            # Symbols per multi-ticker download in get_many()
+
+    'provider': 'yfinance',      # Data source: 'yfinance' (network),
+                                 # 'local' (Parquet/CSV files, offline) or
+                                 # 'synthetic' (deterministic random walk, offline)
+    'provider_dir': 'data/ohlcv',    # 'local' provider: directory of {SYMBOL}_{interval} files
+    'provider_format': 'parquet',    # 'local' provider: 'parquet' or 'csv'
+    'synthetic_seed': 42,            # 'synthetic' provider: base random seed
+
+    # Concurrent universe refresh (DataHandler.fetch_universe)
+    'fetch_workers': 8,          # Concurrent downloads
+    'fetch_retries': 3,          # Retries per symbol after a failed attempt
+    'fetch_backoff': 1.0,        # First retry delay in seconds (doubles per retry)
+    'fetch_rate_limit': 5,       # Max requests per second across workers (None = unlimited)
+
+    'mmap_store_dir': '.ohlcv_store',  # Memory-mapped column store for DataHandler.get_view
+                                       # (zero-copy views shared by parallel workers)
+
+    'compact': False,            # float32 prices + int64 volume, extra columns dropped
+                                 # (~half the memory; for large cross-sectional scans)
+
+    'snapshot_manifest': '.ohlcv_cache/manifest.json',  # Content hashes of the data a run
+                                                        # used (DataHandler.save_manifest)
+}
+
+# ============================================================================
+# DATA QUALITY PARAMETERS
+# ============================================================================
+# Thresholds for the OHLCV quality scanner (data/quality.py); series that
+# exceed them are skipped before indicators are calculated
+# ============================================================================
+
+QUALITY_PARAMS = {
+    'max_missing_ratio': 0.02,   # Max share of exchange sessions missing from daily data
+    'max_zero_volume_run': 5,    # Max consecutive zero-volume bars (None = no check,
+                                 # e.g. for indices and FX without volume)
+    'split_tolerance': 0.03,     # Close-to-close ratio within 3% of 2:1, 3:1, ...
+                                 # counts as an unadjusted split
 }
 
 # ============================================================================
@@ -0,0 +1,154 @@
+"""
+Cross-timeframe alignment
+=========================
+
+Maps bars of one timeframe onto another (daily <-> weekly <-> monthly) with
+binary searches over int64 timestamps, built once per symbol. Strategy code
+uses it to find, for example, the weekly bars inside a month as a range of
+positions, instead of boolean masks over the weekly index for every monthly
+bar and index.get_loc lookups for every weekly bar.
+
+Each bar's close timestamp (the close of the last exchange session of its
+day, week or month) is stored alongside, so "has this bar closed by then?"
+is an integer comparison.
+"""
+
+import numpy as np
+import pandas as pd
+
+from data.market_calendar import EXCHANGE_TIMEZONE, SESSION_CLOSE, last_sessions
+from data.resample import RESAMPLE_FREQUENCIES
+
+
+def _int64(timestamps):
+    """
+    Nanosecond int64 representation of timestamps (a scalar or an index)
+
+    Tz-aware timestamps are taken in UTC. The conversion goes through numpy
+    datetime64[ns], so it also works on pandas < 2 and whatever the
+    resolution of the input.
+    """
+    if isinstance(timestamps, pd.Timestamp) or np.ndim(timestamps) == 0:
+        value = pd.Timestamp(timestamps).to_datetime64()
+        return int(value.astype('datetime64[ns]').astype(np.int64))
+    index = pd.DatetimeIndex(timestamps)
+    if index.tz is not None:
+        index = index.tz_convert(None)
+    return index.values.astype('datetime64[ns]').view(np.int64)
+
+
+def bar_close_times(index, interval, calendar='NYSE'):
+    """
+    Close timestamp of every bar
+
+    Args:
+        index: DatetimeIndex of bar labels (tz-naive dates)
+        interval: '1d', '1wk', '1mo' or '3mo'
+        calendar: 'NYSE', or None for assets that trade every day
+
+    Returns:
+        numpy int64 array of UTC nanoseconds
+    """
+    index = pd.DatetimeIndex(index)
+    naive = index.tz_localize(None) if index.tz is not None else index
+    if interval == '1d':
+        sessions = naive.normalize()
+    else:
+        period_ends = naive.to_period(RESAMPLE_FREQUENCIES[interval]).end_time
+        sessions = last_sessions(period_ends, calendar)
+
+    offset = pd.Timedelta(hours=SESSION_CLOSE.hour, minutes=SESSION_CLOSE.minute)
+    closes = (pd.DatetimeIndex(sessions) + offset).tz_localize(EXCHANGE_TIMEZONE)
+    return _int64(closes)
+
+
+class TimeframeAlignment:
+    """
+    Position lookups between the timeframes of one symbol
+    """
+
+    def __init__(self, timeframes, calendar='NYSE'):
+        """
+        Build the alignment
+
+        Args:
+            timeframes: dict of interval -> DataFrame (or DatetimeIndex) with a
+                        sorted, unique index, e.g. from DataHandler.get_timeframes
+            calendar: Exchange calendar for bar close times ('NYSE' or None)
+        """
+        self.index = {}
+        self.close_times = {}
+        for interval, frame in timeframes.items():
+            if frame is None:
+                continue
+            index = frame if isinstance(frame, pd.DatetimeIndex) else frame.index
+            self.index[interval] = _int64(index)
+            self.close_times[interval] = bar_close_times(index, interval, calendar)
+
+        # Every daily bar's weekly and monthly bar
+        self.daily_to_weekly = None
+        self.daily_to_monthly = None
+        if '1d' in self.index and '1wk' in self.index:
+            self.daily_to_weekly = self.containing('1d', '1wk')
+        if '1d' in self.index and '1mo' in self.index:
+            self.daily_to_monthly = self.containing('1d', '1mo')
+
+    def containing(self, source, target):
+        """
+        Position of the target bar each source bar falls in
+
+        Args:
+            source: Interval of the bars to map (e.g., '1d')
+            target: Interval to map them to (e.g., '1wk')
+
+        Returns:
+            numpy int64 array (-1 where a source bar precedes all target bars)
+        """
+        return np.searchsorted(self.index[target], self.index[source], side='right') - 1
+
+    def position(self, interval, timestamp):
+        """
+        Position of the bar labelled `timestamp` (or of the last one before it)
+
+        Args:
+            interval: Timeframe
+            timestamp: Timestamp, or an array/index of timestamps
+
+        Returns:
+            int or numpy int64 array (-1 before the first bar)
+        """
+        return np.searchsorted(self.index[interval], _int64(timestamp), side='right') - 1
+
+    def between(self, interval, lower=None, upper=None, include_lower=True, include_upper=False):
+        """
+        Positions of the bars whose labels lie between two timestamps
+
+        Args:
+            interval: Timeframe
+            lower: Lower bound (None = from the first bar)
+            upper: Upper bound (None = to the last bar)
+            include_lower: Include bars labelled exactly `lower`
+            include_upper: Include bars labelled exactly `upper`
+
+        Returns:
+            range of bar positions
+        """
+        labels = self.index[interval]
+        first = 0 if lower is None else int(np.searchsorted(
+            labels, _int64(lower), side='left' if include_lower else 'right'))
+        last = len(labels) if upper is None else int(np.searchsorted(
+            labels, _int64(upper), side='right' if include_upper else 'left'))
+        return range(first, max(first, last))
+
+    def closed_by(self, interval, timestamp):
+        """
+        Number of bars that have closed at `timestamp` (a tz-aware time)
+
+        Returns:
+            int: Bars [0, n) have closed
+        """
+        moment = pd.Timestamp(timestamp)
+        if moment.tzinfo is None:
+            moment = moment.tz_localize(EXCHANGE_TIMEZONE)
+        return int(np.searchsorted(self.close_times[interval], _int64(moment.tz_convert('UTC')),
+                                   side='right'))
@@ -2,22 +2,475 @@
 Data handling utilities for trading strategies
 """
 
-import yfinance as yf
+import os
+import threading
+import time
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 
+from config import DATA_PARAMS
+from data.disk_cache import OHLCVDiskCache
+from data.fetch_pool import FetchPool, FetchResult, NoDataError
+from data.freshness import is_fresh
+from data.memory_cache import FrameLRUCache, copy_on_write_enabled
+from data.mmap_store import MmapColumnStore
+from data.intraday import IntradayAssembler
+from data.market_calendar import symbol_calendar
+from data.providers import INTRADAY_MINUTES, create_provider, period_start
+from data.quality import QualityScanner
+from data.resample import RESAMPLE_FREQUENCIES, resample_ohlcv
+from data.single_flight import SingleFlight
+from data.snapshots import SnapshotManifest, stamp
+
+# Process-wide frame cache shared by every DataHandler instance
+_shared_memory_cache = None
+
+
+def shared_memory_cache():
+    """
+    Get the process-wide in-memory frame cache
+
+    Scripts create several DataHandler instances for the same symbols, so the
+    cache is shared to make repeated requests within one run hit memory.
+
+    Returns:
+        FrameLRUCache sized by DATA_PARAMS['memory_cache_mb']
+    """
+    global _shared_memory_cache
+    if _shared_memory_cache is None:
+        max_mb = DATA_PARAMS.get('memory_cache_mb', 256)
+        _shared_memory_cache = FrameLRUCache(max_bytes=int(max_mb * 1024 ** 2))
+    return _shared_memory_cache
+
+
+# Quality verdicts shared by every DataHandler instance
+_quality_scanner = None
+
+
+def shared_quality_scanner():
+    """
+    Get the process-wide data quality scanner
+
+    Returns:
+        QualityScanner using QUALITY_PARAMS and DATA_PARAMS['calendar']
+    """
+    global _quality_scanner
+    if _quality_scanner is None:
+        _quality_scanner = QualityScanner(calendar=DATA_PARAMS.get('calendar', 'NYSE') or None)
+    return _quality_scanner
+
+
+# Content hashes of every frame handed out in this process
+_manifest = SnapshotManifest()
+
+
+def shared_manifest():
+    """
+    Get the process-wide snapshot manifest
+
+    Returns:
+        SnapshotManifest with the latest prepared frame of each symbol/interval
+    """
+    return _manifest
+
+
+# Requests currently being loaded, shared like the memory cache so concurrent
+# callers on different DataHandler instances also coalesce
+_in_flight = SingleFlight()
+
+# FetchPool whose rate limit applies to downloads made by the current thread
+_download_limit = threading.local()
+
+
+def _throttle_download():
+    """Wait for the current thread's fetch pool token before a real download."""
+    pool = getattr(_download_limit, 'pool', None)
+    if pool is not None:
+        pool.throttle()
+
+
+def request_key(symbol, period='2y', interval='1d', start_date=None, end_date=None):
+    """
+    Normalized cache key for a data request
+
+    Dates are reduced to YYYY-MM-DD and the period is ignored when an explicit
+    date range is given, so equivalent requests share one cache entry.
+
+    Returns:
+        tuple: (symbol, interval, period, start, end)
+    """
+    def _day(value):
+        return pd.Timestamp(value).strftime('%Y-%m-%d') if value else None
+
+    if start_date or end_date:
+        period = None
+    return (symbol.upper(), interval, period, _day(start_date), _day(end_date))
+
+
+def _as_index_time(timestamp, index):
+    """Localize a naive timestamp to the timezone of `index` (if it has one)."""
+    timestamp = pd.Timestamp(timestamp)
+    if getattr(index, 'tz', None) is not None and timestamp.tzinfo is None:
+        return timestamp.tz_localize(index.tz)
+    return timestamp
+
+
+# Periods a window request may be widened to, shortest first
+HISTORY_PERIODS = ['1mo', '3mo', '6mo', '1y', '2y', '5y', '10y', 'max']
+
+
+def slice_window(data, start=None, end=None):
+    """
+    Rows in [start, end) found by binary search on a sorted index
+
+    The result is a positional slice, so it shares the parent's data.
+
+    Args:
+        data: DataFrame with a sorted DatetimeIndex
+        start: First timestamp (None = from the beginning)
+        end: Exclusive end timestamp (None = to the end)
+
+    Returns:
+        DataFrame slice
+    """
+    index = data.index
+    first = index.searchsorted(_as_index_time(start, index), side='left') if start is not None else 0
+    last = index.searchsorted(_as_index_time(end, index), side='left') if end is not None else len(index)
+    return data.iloc[first:last]
+
+
+def covering_period(start):
+    """Shortest period in HISTORY_PERIODS that reaches back to `start`."""
+    if start is None:
+        return 'max'
+    for period in HISTORY_PERIODS:
+        period_first = period_start(period)
+        if period_first is None or period_first <= start:
+            return period
+    return 'max'
+
+
+def project_columns(data, columns):
+    """
+    Select the columns a consumer needs
+
+    Under copy-on-write the selection shares the parent's data, so no values
+    are copied until something writes to them.
+
+    Args:
+        data: Prepared DataFrame (or None)
+        columns: Column names (e.g., an indicator's input columns); names the
+                 frame does not have are skipped, None keeps every column
+
+    Returns:
+        DataFrame with the requested columns in the requested order
+    """
+    if data is None or columns is None:
+        return data
+    return data[[column for column in columns if column in data.columns]]
+
+
+def compact_ohlcv(data):
+    """
+    Shrink a prepared OHLCV frame for holding many symbols in memory
+
+    Keeps only Open/High/Low/Close (as float32) and Volume (as int64) and
+    drops every other column, which shrinks a daily frame with Adj Close to
+    about 57% of its size (the index is the rest). Prices are rounded to
+    float32 (~6e-8 relative); the indicators upcast to float64 internally
+    and their tolerances are documented in calculate_fair_value_bands and
+    BXtrender.calculate.
+
+    Args:
+        data: Prepared OHLCV DataFrame
+
+    Returns:
+        Compact DataFrame
+    """
+    columns = {}
+    for col in ['Open', 'High', 'Low', 'Close']:
+        if col in data.columns:
+            columns[col] = data[col].to_numpy(dtype=np.float32)
+    if 'Volume' in data.columns:
+        columns['Volume'] = np.round(data['Volume'].to_numpy()).astype(np.int64)
+
+    compact = pd.DataFrame(columns, index=data.index)
+    compact.columns.name = data.columns.name
+    return compact
+
+
+def _has_nans(data):
+    """
+    Check a frame for missing values without building boolean masks
+
+    A float column contains NaN exactly when its sum is NaN (a column holding
+    both +inf and -inf also sums to NaN and is sent down the slow path, which
+    is harmless). Integer and bool columns cannot hold NaN.
+    """
+    for col in data.columns:
+        series = data[col]
+        kind = series.dtype.kind
+        if kind == 'f':
+            if np.isnan(np.add.reduce(series.to_numpy())):
+                return True
+        elif kind not in 'iub' and series.hasnans:
+            return True
+    return False
+
+
+def _is_prepared(data):
+    """
+    Check whether a (flat-column) frame already satisfies prepare_data
+
+    True when the index is a sorted DatetimeIndex, the OHLCV columns are
+    numeric and nothing is missing, so preparation would not change a value.
+    """
+    if not isinstance(data.index, pd.DatetimeIndex) or not data.index.is_monotonic_increasing:
+        return False
+    for col in ['Open', 'High', 'Low', 'Close', 'Volume']:
+        if col in data.columns and not pd.api.types.is_numeric_dtype(data[col]):
+            return False
+    return not _has_nans(data)
+
+
+def split_batch(data, symbols, prepare):
+    """
+    Split a multi-ticker yfinance frame into per-symbol frames
+
+    Args:
+        data: DataFrame with (Price, Ticker) MultiIndex columns
+        symbols: Symbols that were requested
+        prepare: Callable turning a raw single-symbol frame into a prepared one
+
+    Returns:
+        dict: Symbol -> prepared DataFrame (symbols without data are omitted)
+    """
+    required_cols = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+    if not isinstance(data.columns, pd.MultiIndex):
+        # A single ticker may come back with flat columns
+        return {symbols[0]: prepare(data.dropna())} if len(symbols) == 1 else {}
+
+    ticker_level = 1 if set(symbols) & set(data.columns.get_level_values(1)) else 0
+
+    frames = {}
+    for symbol in symbols:
+        if symbol not in data.columns.get_level_values(ticker_level):
+            continue
+        frame = data.xs(symbol, axis=1, level=ticker_level)
+        # Rows of the other tickers' trading days are all-NaN for this one
+        frame = frame.dropna(how='all').dropna()
+        if frame.empty or not all(col in frame.columns for col in required_cols):
+            continue
+        frames[symbol] = prepare(frame)
+
+    return frames
+
 
 class DataHandler:
     """
     Handles data fetching and preparation for trading strategies
     """
 
-    def __init__(self):
-        self.data_cache = {}
+    def __init__(self, cache_dir=None, memory_cache=None, provider=None, store_dir=None,
+                 compact=None, calendar=None):
+        """
+        Initialize the data handler
 
-    def fetch_yfinance_data(self, symbol, period='2y', interval='1d', start_date=None, end_date=None):
+        Args:
+            cache_dir: Directory for the persistent OHLCV cache
+                       (default: DATA_PARAMS['cache_dir']; None/'' disables it)
+            memory_cache: FrameLRUCache for prepared frames
+                          (default: the process-wide shared cache)
+            provider: DataProvider instance or provider name
+                      (default: DATA_PARAMS['provider'])
+            store_dir: Directory of the memory-mapped column store used by
+                       get_view (default: DATA_PARAMS['mmap_store_dir'])
+            compact: Return float32 OHLC + int64 Volume frames without extra
+                     columns (default: DATA_PARAMS['compact'])
+            calendar: Exchange calendar deciding when cached bars are final
+                      (default: DATA_PARAMS['calendar']; '' always refreshes).
+                      Symbols that trade around the clock (crypto pairs, FX,
+                      futures) never use it, see calendar_for
         """
-        Fetch data from Yahoo Finance
+        if provider is None or isinstance(provider, str):
+            provider = create_provider(provider)
+        self.provider = provider
+        self.compact = DATA_PARAMS.get('compact', False) if compact is None else compact
+        self.calendar = DATA_PARAMS.get('calendar', 'NYSE') if calendar is None else calendar
+
+        self.data_cache = memory_cache if memory_cache is not None else shared_memory_cache()
+
+        # Only remote providers are worth caching on disk; entries are kept
+        # per provider configuration so switching sources never mixes histories
+        if cache_dir is None:
+            cache_dir = DATA_PARAMS.get('cache_dir')
+        if cache_dir and provider.cacheable:
+            self.disk_cache = OHLCVDiskCache(os.path.join(cache_dir, provider.cache_namespace))
+        else:
+            self.disk_cache = None
+
+        if store_dir is None:
+            store_dir = DATA_PARAMS.get('mmap_store_dir')
+        if store_dir:
+            store_name = provider.cache_namespace + ('_compact' if self.compact else '')
+            self.store = MmapColumnStore(os.path.join(store_dir, store_name))
+        else:
+            self.store = None
+
+    def calendar_for(self, symbol):
+        """
+        Exchange calendar that applies to a symbol
+
+        Args:
+            symbol: Trading symbol
+
+        Returns:
+            'NYSE', or None if the symbol's cached bars are never final
+            (around-the-clock symbols such as BTC-USD, or calendar '')
+        """
+        return symbol_calendar(symbol, self.calendar)
+
+    def _memory_fresh(self, symbol, interval):
+        """
+        Freshness check for memory cache hits (see FrameLRUCache.get)
+
+        Entries younger than DATA_PARAMS['memory_cache_ttl'] are served as
+        is. Older ones are only served while the freshness policy says their
+        bars cannot change any more (data.freshness.is_fresh).
+        """
+        ttl = DATA_PARAMS.get('memory_cache_ttl', 300)
+        calendar = self.calendar_for(symbol)
+
+        def fresh(frame, stored_at):
+            if ttl is None or time.time() - stored_at <= ttl:
+                return True
+            if len(frame) == 0:
+                return False
+            meta = {
+                'updated_at': datetime.fromtimestamp(stored_at).astimezone().isoformat(),
+                'last_bar': frame.index[-1].isoformat(),
+            }
+            return is_fresh(meta, interval, calendar=calendar)
+
+        return fresh
+
+    def get_intraday_history(self, symbol, period='60d', interval='5m', start_date=None,
+                             end_date=None):
+        """
+        Get intraday bars through the chunked intraday assembler
+
+        Args:
+            symbol: Trading symbol
+            period: Period to return (ignored if start_date is given)
+            interval: Intraday interval
+            start_date: Start date (optional)
+            end_date: End date, exclusive (optional)
+
+        Returns:
+            Prepared DataFrame (limited to what the provider and cache hold)
+        """
+        start = pd.Timestamp(start_date) if start_date else period_start(period)
+        data = IntradayAssembler(self).assemble(symbol, interval, start)
+        if data is None:
+            return None
+
+        if start is not None:
+            data = data[data.index >= _as_index_time(start, data.index)]
+        if end_date:
+            data = data[data.index < _as_index_time(end_date, data.index)]
+        return data
+
+    def get_window(self, symbol, interval='1d', start_date=None, end_date=None,
+                   raise_errors=False):
+        """
+        Get a date range by slicing cached history
+
+        Windows that end before the last cached bar are answered by a binary
+        search on the cached index, without a download. Otherwise, with the
+        persistent cache enabled, the shortest period covering the window is
+        brought up to date (a tail refresh, or nothing if the cache is fresh)
+        and sliced; without it the window is downloaded as requested.
+
+        Args:
+            symbol: Trading symbol
+            interval: Data interval
+            start_date: Start date (optional)
+            end_date: End date, exclusive (optional)
+            raise_errors: Raise download errors instead of returning None
+
+        Returns:
+            Prepared DataFrame
+        """
+        return self._window(symbol, interval, start_date, end_date, raise_errors)[0]
+
+    def _window(self, symbol, interval, start_date, end_date, raise_errors):
+        """
+        Get a date range, reporting whether it had to be downloaded on its own
+
+        Returns:
+            tuple: (prepared DataFrame or None, True if the window was
+                    downloaded rather than sliced out of cached history)
+        """
+        start = pd.Timestamp(start_date) if start_date else None
+        end = pd.Timestamp(end_date) if end_date else None
+
+        history = self._cached_history(symbol, interval, start)
+        if history is not None and len(history):
+            last_day = history.index[-1].tz_localize(None).normalize()
+            if end is None or end > last_day:
+                history = None
+
+        if history is None:
+            if self.disk_cache is None:
+                raw_data = self.fetch_data(symbol, interval=interval, start_date=start_date,
+                                           end_date=end_date, raise_errors=raise_errors)
+                return (self.prepare_data(raw_data) if raw_data is not None else None), True
+            history = self.get_data(symbol, period=covering_period(start), interval=interval,
+                                    raise_errors=raise_errors)
+            if history is None:
+                return None, False
+
+        # The cached history is not detached, so the slice gets its own copy
+        window = slice_window(history, start, end)
+        return window.copy(deep=not copy_on_write_enabled()), False
+
+    def _cached_history(self, symbol, interval, start):
+        """
+        Cached history reaching back to `start`, without any download
+
+        Looks in the memory cache for a period request that covers `start`,
+        then in the persistent cache.
+
+        Returns:
+            Prepared DataFrame (the cached frame itself, not a copy), or None
+            if nothing cached covers `start`
+        """
+        for period in reversed(HISTORY_PERIODS):
+            period_first = period_start(period)
+            if period_first is not None and (start is None or start < period_first):
+                break
+            history = self.data_cache.get(self._request_key(symbol, period, interval),
+                                          self._memory_fresh(symbol, interval), detach=False)
+            if history is not None:
+                return history
+
+        if self.disk_cache is not None:
+            cached, meta = self.disk_cache.load(symbol, interval)
+            if self.disk_cache.covers(meta, start) and len(cached) > 0:
+                return cached
+        return None
+
+    def _request_key(self, symbol, period='2y', interval='1d', start_date=None, end_date=None):
+        """Memory cache key for a request against this handler's provider."""
+        return ((self.provider.cache_namespace, self.compact) +
+                request_key(symbol, period, interval, start_date, end_date))
+
+    def fetch_data(self, symbol, period='2y', interval='1d', start_date=None, end_date=None,
+                   raise_errors=False):
+        """
+        Fetch data from the configured provider
 
         Args:
             symbol: Stock/crypto symbol
@@ -25,20 +478,19 @@ class DataHandler:
             interval: Data interval (e.g., '1d', '1h', '15m')
             start_date: Start date (optional)
             end_date: End date (optional)
+            raise_errors: Raise instead of printing the error and returning None
 
         Returns:
             DataFrame with OHLC data
         """
         try:
             # Download data
-            if start_date and end_date:
-                data = yf.download(symbol, start=start_date, end=end_date, interval=interval)
-            else:
-                data = yf.download(symbol, period=period, interval=interval)
+            _throttle_download()
+            data = self.provider.download(symbol, period, interval, start_date, end_date)
 
             # Clean and format data
             if data.empty:
-                raise ValueError(f"No data found for symbol {symbol}")
+                raise NoDataError(f"No data found for symbol {symbol}")
 
             # Ensure we have the required columns
             required_cols = ['Open', 'High', 'Low', 'Close', 'Volume']
@@ -46,50 +498,63 @@ class DataHandler:
                 raise ValueError(f"Missing required columns in data for {symbol}")
 
             # Remove any rows with NaN values
-            data = data.dropna()
-
-            # Cache the data
-            cache_key = f"{symbol}_{period}_{interval}_{start_date}_{end_date}"
-            self.data_cache[cache_key] = data
+            if _has_nans(data):
+                data = data.dropna()
 
             return data
 
         except Exception as e:
+            if raise_errors:
+                raise
             print(f"Error fetching data for {symbol}: {str(e)}")
             return None
 
+    # Kept for callers written against the yfinance-only handler
+    fetch_yfinance_data = fetch_data
+
     def prepare_data(self, data):
         """
         Prepare data for indicator calculations
 
+        Data that is already clean (sorted DatetimeIndex, numeric OHLCV, no
+        NaNs) takes a fast path: nothing is copied and the input frame is
+        returned as is (or as a shallow copy with flattened yfinance
+        columns). Everything else gets the full copy/sort/coerce/dropna pass.
+
         Args:
             data: Raw OHLC data
 
         Returns:
             Prepared DataFrame
         """
-        df = data.copy()
-
         # Handle MultiIndex columns from yfinance
-        if isinstance(df.columns, pd.MultiIndex):
-            # Flatten MultiIndex columns
-            df.columns = df.columns.droplevel(1)
+        if isinstance(data.columns, pd.MultiIndex):
+            # Flatten MultiIndex columns (metadata only, no data copy)
+            data = data.copy(deep=False)
+            data.columns = data.columns.droplevel(1)
+
+        if _is_prepared(data):
+            return data
+
+        df = data.copy()
 
         # Ensure datetime index
         if not isinstance(df.index, pd.DatetimeIndex):
             df.index = pd.to_datetime(df.index)
 
         # Sort by date
-        df = df.sort_index()
+        if not df.index.is_monotonic_increasing:
+            df = df.sort_index()
 
         # Ensure we have numeric data types
         numeric_columns = ['Open', 'High', 'Low', 'Close', 'Volume']
         for col in numeric_columns:
-            if col in df.columns:
+            if col in df.columns and not pd.api.types.is_numeric_dtype(df[col]):
                 df[col] = pd.to_numeric(df[col], errors='coerce')
 
         # Remove any rows with NaN values
-        df = df.dropna()
+        if _has_nans(df):
+            df = df.dropna()
 
         return df
 
@@ -99,7 +564,9 @@ class DataHandler:
 
         Args:
             symbol: Trading symbol
-            **params: Data fetching parameters
+            **params: Data fetching parameters; columns= limits the returned
+                      frame to those columns (e.g., BXtrender.INPUT_COLUMNS),
+                      and only those are read from a fresh persistent cache
 
         Returns:
             Prepared DataFrame
@@ -109,18 +576,562 @@ class DataHandler:
         interval = params.get('interval', '1d')
         start_date = params.get('start_date')
         end_date = params.get('end_date')
+        raise_errors = params.get('raise_errors', False)
+        columns = params.get('columns')
+
+        # Serve repeated requests from memory
+        cache_key = self._request_key(symbol, period, interval, start_date, end_date)
+        fresh = self._memory_fresh(symbol, interval)
+        cached = self.data_cache.get(cache_key, fresh)
+        if cached is not None:
+            return project_columns(cached, columns)
+
+        if columns is not None:
+            projected = self._load_columns(symbol, period, interval, start_date, end_date,
+                                           columns, cache_key, fresh)
+            if projected is not None:
+                return projected
 
-        # Fetch data
-        raw_data = self.fetch_yfinance_data(symbol, period, interval, start_date, end_date)
+        def load():
+            # A caller that missed just before an identical load finished
+            # finds its result here instead of downloading again
+            cached = self.data_cache.get(cache_key, fresh)
+            if cached is not None:
+                return cached
+            return self._load_data(symbol, period, interval, start_date, end_date,
+                                   raise_errors, cache_key)
 
-        if raw_data is None:
+        # Concurrent callers for the same request share one load
+        prepared_data, shared = _in_flight.do(cache_key + (raise_errors,), load)
+        if shared and prepared_data is not None:
+            prepared_data = prepared_data.copy(deep=not copy_on_write_enabled())
+        return project_columns(prepared_data, columns)
+
+    def _assembles_intraday(self, interval):
+        """Check whether an interval is loaded through the intraday assembler."""
+        return interval in INTRADAY_MINUTES and (self.disk_cache is not None or
+                                                 getattr(self.provider, 'intraday_limits', None))
+
+    def _load_columns(self, symbol, period, interval, start_date, end_date, columns,
+                      cache_key, fresh):
+        """
+        Read only `columns` of a request the persistent cache answers as is
+
+        Applies when the cached entry covers the period and is fresh, so no
+        tail has to be merged in; only those columns are read from Parquet.
+        The projection is memory-cached under its own key.
+
+        Returns:
+            Prepared DataFrame with the requested columns, or None if the
+            request needs the full load path
+        """
+        if self.disk_cache is None or start_date or end_date or interval in INTRADAY_MINUTES:
             return None
 
-        # Prepare data
-        prepared_data = self.prepare_data(raw_data)
+        key = cache_key + (tuple(columns),)
+        cached = self.data_cache.get(key, fresh)
+        if cached is not None:
+            return cached
+
+        start = period_start(period)
+        meta = self.disk_cache.load_meta(symbol, interval)
+        if not (self.disk_cache.covers(meta, start) and meta.get('rows') and
+                is_fresh(meta, interval, calendar=self.calendar_for(symbol))):
+            return None
+
+        data, _ = self.disk_cache.load(symbol, interval, columns=columns)
+        if data is None or data.empty:
+            return None
+        if start is not None:
+            data = data[data.index >= _as_index_time(start, data.index)]
+        if self.compact:
+            data = compact_ohlcv(data)
+
+        # Projections are not recorded in the manifest (see _snapshot)
+        self.data_cache.put(key, data)
+        return data
+
+    def _load_data(self, symbol, period, interval, start_date, end_date, raise_errors,
+                   cache_key):
+        """Load, prepare and memory-cache a request that missed the memory cache."""
+        cache_result = True
+        if self._assembles_intraday(interval):
+            # Intraday history is assembled from windows the provider accepts
+            prepared_data = self.get_intraday_history(symbol, period, interval, start_date, end_date)
+            if prepared_data is None:
+                return None
+        elif self.disk_cache is not None and not (start_date or end_date):
+            # Period requests are served from the persistent cache when enabled
+            prepared_data = self.get_cached_history(symbol, period, interval, raise_errors)
+            if prepared_data is None:
+                return None
+        elif start_date or end_date:
+            # Date ranges are sliced out of cached history where possible;
+            # slices are not memory-cached, the history entry serves them
+            prepared_data, downloaded = self._window(symbol, interval, start_date, end_date,
+                                                     raise_errors)
+            if prepared_data is None:
+                return None
+            cache_result = downloaded
+        else:
+            # Fetch data
+            raw_data = self.fetch_data(symbol, period, interval, start_date, end_date, raise_errors)
+
+            if raw_data is None:
+                return None
+
+            # Prepare data
+            prepared_data = self.prepare_data(raw_data)
+
+        self._snapshot(symbol, interval, prepared_data)
+        if self.compact:
+            prepared_data = compact_ohlcv(prepared_data)
+
+        if cache_result:
+            self.data_cache.put(cache_key, prepared_data)
 
         return prepared_data
 
+    def get_timeframes(self, symbol, periods, calendar=None, columns=None):
+        """
+        Get several timeframes for a symbol from a single daily download
+
+        Daily bars are fetched once for the longest requested period and the
+        weekly/monthly bars are resampled from them locally, which keeps the
+        timeframes consistent with each other.
+
+        Args:
+            symbol: Trading symbol
+            periods: Dict mapping interval to period,
+                     e.g. {'1d': 'max', '1wk': '10y', '1mo': '10y'}
+            calendar: Exchange calendar used for bar completeness
+                      (default: the handler's calendar for the symbol, see
+                      calendar_for; '' for assets that trade every day)
+            columns: Daily columns to load (default: all), e.g.
+                     BXtrender.INPUT_COLUMNS; resampled bars keep only these
+
+        Returns:
+            dict: Interval -> prepared DataFrame (None values if the download failed)
+        """
+        for interval in periods:
+            if interval != '1d' and interval not in RESAMPLE_FREQUENCIES:
+                raise ValueError(f"Cannot derive interval {interval} from daily bars")
+
+        starts = {interval: period_start(period) for interval, period in periods.items()}
+        if any(start is None for start in starts.values()):
+            longest = 'max'
+        else:
+            longest = min(periods.values(), key=period_start)
+
+        daily = self.get_data(symbol, period=longest, interval='1d', columns=columns)
+        if daily is None:
+            return {interval: None for interval in periods}
+
+        if calendar is None:
+            calendar = self.calendar_for(symbol)
+
+        # get_data already recorded the daily frame; frames derived from a
+        # projected or compact one are not recorded (see _snapshot)
+        record = columns is None and not self.compact
+        frames = {}
+        for interval, start in starts.items():
+            frame = daily if interval == '1d' else resample_ohlcv(daily, interval, calendar or None)
+            if start is not None:
+                frame = frame[frame.index >= _as_index_time(start, frame.index)]
+            if record and (interval != '1d' or len(frame) != len(daily)):
+                self._snapshot(symbol, interval, frame)
+            frames[interval] = frame
+
+        return frames
+
+    def _snapshot(self, symbol, interval, data):
+        """
+        Stamp a prepared frame with its content hash and record it in the manifest
+
+        Only full prepared frames are recorded (compact frames before they
+        are compacted, column projections not at all), so the entry for a
+        symbol/interval always describes the full data. The frame is hashed
+        once for both.
+        """
+        _manifest.record(symbol, interval, data, digest=stamp(data))
+
+    def save_manifest(self, path=None):
+        """
+        Write the snapshot manifest of this process
+
+        Results saved alongside it can later be checked with
+        SnapshotManifest.load(path).matches(symbol, interval, data).
+
+        Args:
+            path: Output file (default: DATA_PARAMS['snapshot_manifest'])
+        """
+        _manifest.save(path or DATA_PARAMS.get('snapshot_manifest', 'snapshot_manifest.json'))
+
+    def fetch_universe(self, symbols, max_workers=None, max_retries=None, backoff=None,
+                       rate_limit=None, validate=True, **params):
+        """
+        Fetch many symbols concurrently with retries and rate limiting
+
+        Each symbol goes through get_data (so caches are used and filled) on
+        a FetchPool. The rate limit only applies to real downloads, so symbols
+        served from the caches do not wait for it. Unset pool settings come
+        from DATA_PARAMS. Fetched series
+        are then checked by the quality scanner, and those that fail get
+        status 'invalid' so indicator loops skip them.
+
+        Args:
+            symbols: List of trading symbols
+            max_workers: Concurrent fetches (DATA_PARAMS['fetch_workers'])
+            max_retries: Retries per symbol (DATA_PARAMS['fetch_retries'])
+            backoff: First retry delay in seconds (DATA_PARAMS['fetch_backoff'])
+            rate_limit: Requests per second (DATA_PARAMS['fetch_rate_limit'])
+            validate: Run the quality scanner on fetched series
+            **params: Data fetching parameters (as for get_data)
+
+        Returns:
+            dict: Symbol -> FetchResult with status 'ok', 'no_data', 'failed'
+                  or 'invalid' (quality report in .quality)
+        """
+        def _or_default(value, key, default):
+            return value if value is not None else DATA_PARAMS.get(key, default)
+
+        def fetch(symbol):
+            _download_limit.pool = pool
+            try:
+                return self.get_data(symbol, raise_errors=True, **params)
+            finally:
+                _download_limit.pool = None
+
+        params.pop('raise_errors', None)
+        pool = FetchPool(
+            fetch,
+            max_workers=_or_default(max_workers, 'fetch_workers', 8),
+            max_retries=_or_default(max_retries, 'fetch_retries', 3),
+            backoff=_or_default(backoff, 'fetch_backoff', 1.0),
+            rate_limit=_or_default(rate_limit, 'fetch_rate_limit', None),
+            self_limited=True,
+        )
+        results = pool.run(symbols)
+
+        if validate:
+            interval = params.get('interval', '1d')
+            for result in results.values():
+                if result.ok:
+                    result.quality = self.check_quality(result.symbol, result.data, interval)
+                    if not result.quality.ok:
+                        result.status = FetchResult.INVALID
+        return results
+
+    def check_quality(self, symbol, data, interval='1d'):
+        """
+        Validate a prepared series (verdicts are cached while the data is unchanged)
+
+        Args:
+            symbol: Trading symbol
+            data: Prepared OHLCV DataFrame
+            interval: Data interval
+
+        Returns:
+            QualityReport; problems are printed
+        """
+        report = shared_quality_scanner().scan(symbol, data, interval)
+        if not report.ok:
+            print(f"Data quality check failed for {symbol} ({interval}): "
+                  f"{', '.join(report.errors)} {report.issues}")
+        return report
+
+    def get_view(self, symbol, interval='1d', columns=None, refresh=False):
+        """
+        Zero-copy view of a symbol's full history from the column store
+
+        The first call (or refresh=True) loads the full history through
+        get_data and writes it to the store. After that the frame is a
+        read-only view over memory-mapped files, shared through the page
+        cache by every process that opens the same store.
+
+        Args:
+            symbol: Trading symbol
+            interval: Data interval
+            columns: Columns to map (default: all), e.g. an indicator's input
+                     columns; unmapped columns are never read
+            refresh: Reload from the provider and rewrite the store first
+
+        Returns:
+            Read-only DataFrame, or None if no data was found
+        """
+        if self.store is None:
+            raise ValueError("No column store configured (set DATA_PARAMS['mmap_store_dir'])")
+
+        if refresh or not self.store.contains(symbol, interval):
+            data = self.get_data(symbol, period='max', interval=interval)
+            if data is None:
+                return None
+            self.store.write(symbol, interval, data)
+
+        return self.store.read(symbol, interval, columns)
+
+    def cache_stats(self):
+        """
+        In-memory cache statistics
+
+        Returns:
+            dict: hits, misses, evictions, expired, entries, bytes and max_bytes, plus
+                  coalesced (requests that waited on an identical one in flight)
+        """
+        stats = self.data_cache.stats()
+        stats['coalesced'] = _in_flight.coalesced
+        return stats
+
+    def get_cached_history(self, symbol, period='2y', interval='1d', raise_errors=False):
+        """
+        Get prepared data through the persistent cache
+
+        The first call downloads the requested period and stores it. Later
+        calls only download bars from the last cached timestamp onwards and
+        append them, so a nightly refresh costs a few rows instead of the
+        whole history. A cache that is still fresh (written after the last
+        session closed, see data.freshness) is returned without any download.
+
+        Args:
+            symbol: Trading symbol
+            period: Period to return (e.g., '2y', 'max')
+            interval: Data interval
+            raise_errors: Raise download errors instead of returning None
+
+        Returns:
+            Prepared DataFrame
+        """
+        start = period_start(period)
+        cached, meta = self.disk_cache.load(symbol, interval)
+
+        if self.disk_cache.covers(meta, start) and len(cached) > 0:
+            if is_fresh(meta, interval, calendar=self.calendar_for(symbol)):
+                data = cached
+            else:
+                data = self._refresh_tail(symbol, interval, cached, meta)
+        else:
+            raw_data = self.fetch_data(symbol, period, interval, raise_errors=raise_errors)
+            if raw_data is None:
+                return None
+            data = OHLCVDiskCache.merge(cached, self.prepare_data(raw_data))
+            self.disk_cache.save(symbol, interval, data, start=start)
+
+        if start is not None:
+            data = data[data.index >= _as_index_time(start, data.index)]
+
+        return data
+
+    @staticmethod
+    def _tail_anchor(cached):
+        """Timestamp a tail refresh starts from (the second-to-last cached bar)."""
+        return cached.index[-2] if len(cached) > 1 else cached.index[-1]
+
+    def _refresh_tail(self, symbol, interval, cached, meta):
+        """
+        Download bars newer than the cache and append them
+
+        Args:
+            symbol: Trading symbol
+            interval: Data interval
+            cached: Cached DataFrame
+            meta: Cache metadata
+
+        Returns:
+            Up-to-date prepared DataFrame
+        """
+        anchor = self._tail_anchor(cached)
+        raw_tail = self.fetch_data(symbol, interval=interval,
+                                   start_date=anchor.strftime('%Y-%m-%d'))
+        if raw_tail is None:
+            print(f"Using cached data for {symbol} ({interval}) without refresh")
+            return cached
+
+        return self._apply_tail(symbol, interval, cached, meta, self.prepare_data(raw_tail))
+
+    def _apply_tail(self, symbol, interval, cached, meta, tail):
+        """
+        Merge freshly downloaded bars into cached history and save it
+
+        The tail starts at the second-to-last cached bar. The last bar may
+        have been cached while still forming, so it gets replaced, and the
+        completed bar before it is compared against the fresh download. A
+        mismatch means the provider re-adjusted history (dividend or split),
+        in which case the whole cached range is downloaded again.
+
+        Args:
+            symbol: Trading symbol
+            interval: Data interval
+            cached: Cached DataFrame
+            meta: Cache metadata
+            tail: Prepared DataFrame of bars from the tail anchor onwards
+
+        Returns:
+            Up-to-date prepared DataFrame
+        """
+        anchor = self._tail_anchor(cached)
+        start = pd.Timestamp(meta['start']) if meta['start'] else None
+
+        if len(cached) > 1 and anchor in tail.index:
+            old_close = cached.at[anchor, 'Close']
+            new_close = tail.at[anchor, 'Close']
+            if abs(new_close - old_close) > 1e-6 * abs(old_close):
+                print(f"History for {symbol} ({interval}) was re-adjusted, refetching")
+                if start is None:
+                    raw_data = self.fetch_data(symbol, 'max', interval)
+                else:
+                    raw_data = self.fetch_data(symbol, interval=interval,
+                                               start_date=start.strftime('%Y-%m-%d'))
+                if raw_data is None:
+                    return cached
+                data = self.prepare_data(raw_data)
+                self.disk_cache.save(symbol, interval, data, start=start)
+                return data
+
+        data = OHLCVDiskCache.merge(cached, tail)
+        self.disk_cache.save(symbol, interval, data, start=start)
+        return data
+
+    def download_batch(self, symbols, period='2y', interval='1d', start_date=None, end_date=None):
+        """
+        Download several symbols with one multi-ticker request
+
+        Args:
+            symbols: List of trading symbols
+            period: Period to fetch
+            interval: Data interval
+            start_date: Start date (optional)
+            end_date: End date (optional)
+
+        Returns:
+            dict: Symbol -> prepared DataFrame (symbols without data are omitted)
+        """
+        try:
+            _throttle_download()
+            data = self.provider.download(list(symbols), period, interval, start_date, end_date)
+        except Exception as e:
+            print(f"Error fetching batch of {len(symbols)} symbols: {str(e)}")
+            return {}
+
+        if data is None or data.empty:
+            return {}
+
+        return split_batch(data, symbols, self.prepare_data)
+
+    def get_many(self, symbols, chunk_size=None, **params):
+        """
+        Get and prepare data for many symbols using batched downloads
+
+        Symbols already in the memory cache are served from it. The rest are
+        downloaded in multi-ticker requests of `chunk_size` symbols, split
+        into per-symbol prepared frames and written to the caches. When the
+        persistent cache is enabled, symbols it already covers only have
+        their tails downloaded (also batched), or nothing if still fresh;
+        with columns= only those columns are read for fresh symbols.
+        Intraday intervals are assembled per symbol like get_data does,
+        since a batched request cannot reach past the provider's look-back.
+
+        Args:
+            symbols: List of trading symbols
+            chunk_size: Symbols per request (default: DATA_PARAMS['batch_size'])
+            **params: Data fetching parameters (as for get_data)
+
+        Returns:
+            dict: Symbol -> prepared DataFrame, or None if no data was found
+        """
+        columns = params.get('columns')
+        period = params.get('period', '2y')
+        interval = params.get('interval', '1d')
+        start_date = params.get('start_date')
+        end_date = params.get('end_date')
+        chunk_size = chunk_size or DATA_PARAMS.get('batch_size', 50)
+
+        results = {}
+        projected = {}
+        pending = []
+        for symbol in dict.fromkeys(symbols):
+            cache_key = self._request_key(symbol, period, interval, start_date, end_date)
+            fresh = self._memory_fresh(symbol, interval)
+            cached = self.data_cache.get(cache_key, fresh)
+            if cached is not None:
+                results[symbol] = cached
+                continue
+            if columns is not None:
+                frame = self._load_columns(symbol, period, interval, start_date, end_date,
+                                           columns, cache_key, fresh)
+                if frame is not None:
+                    projected[symbol] = frame
+                    continue
+            pending.append(symbol)
+
+        # Intraday history is assembled per symbol from windows the provider
+        # accepts; a batched request would be cut off at its look-back
+        batched = pending
+        if self._assembles_intraday(interval):
+            for symbol in pending:
+                results[symbol] = self.get_intraday_history(symbol, period, interval,
+                                                            start_date, end_date)
+            batched = []
+
+        use_disk = self.disk_cache is not None and not (start_date or end_date)
+        start = period_start(period) if use_disk else None
+
+        # Symbols the persistent cache covers only need their tails
+        history = {}
+        stale = []
+        for symbol in batched:
+            cached, meta = self.disk_cache.load(symbol, interval) if use_disk else (None, None)
+            if use_disk and self.disk_cache.covers(meta, start) and len(cached) > 0:
+                if is_fresh(meta, interval, calendar=self.calendar_for(symbol)):
+                    results[symbol] = cached
+                else:
+                    history[symbol] = (cached, meta)
+            else:
+                stale.append(symbol)
+
+        covered = list(history)
+        for i in range(0, len(covered), chunk_size):
+            chunk = covered[i:i + chunk_size]
+            anchor = min(self._tail_anchor(history[symbol][0]) for symbol in chunk)
+            tails = self.download_batch(chunk, interval=interval,
+                                        start_date=anchor.strftime('%Y-%m-%d'))
+            for symbol in chunk:
+                cached, meta = history[symbol]
+                if symbol in tails:
+                    tail = tails[symbol]
+                    tail = tail[tail.index >= self._tail_anchor(cached)]
+                    results[symbol] = self._apply_tail(symbol, interval, cached, meta, tail)
+                else:
+                    print(f"Using cached data for {symbol} ({interval}) without refresh")
+                    results[symbol] = cached
+
+        for i in range(0, len(stale), chunk_size):
+            chunk = stale[i:i + chunk_size]
+            frames = self.download_batch(chunk, period, interval, start_date, end_date)
+            for symbol in chunk:
+                frame = frames.get(symbol)
+                if frame is not None and use_disk:
+                    cached, _ = self.disk_cache.load(symbol, interval)
+                    frame = OHLCVDiskCache.merge(cached, frame)
+                    self.disk_cache.save(symbol, interval, frame, start=start)
+                results[symbol] = frame
+
+        for symbol in pending:
+            frame = results.get(symbol)
+            if frame is None:
+                print(f"Error fetching data for {symbol}: No data found")
+                continue
+            if start is not None:
+                frame = frame[frame.index >= _as_index_time(start, frame.index)]
+            self._snapshot(symbol, interval, frame)
+            if self.compact:
+                frame = compact_ohlcv(frame)
+            self.data_cache.put(self._request_key(symbol, period, interval, start_date, end_date), frame)
+            results[symbol] = frame
+
+        results = {symbol: project_columns(frame, columns) for symbol, frame in results.items()}
+        results.update(projected)
+        return {symbol: results.get(symbol) for symbol in dict.fromkeys(symbols)}
+
 
 def get_sample_data(symbol='AAPL', days=500):
     """
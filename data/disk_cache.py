@@ -0,0 +1,168 @@
+"""
+Persistent OHLCV cache
+======================
+
+Stores prepared OHLCV frames on disk as Parquet files, one file per
+symbol/interval pair, with a small JSON sidecar describing what the file
+covers. DataHandler uses it to download only the bars newer than the last
+cached timestamp instead of refetching the whole history on every run.
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+
+import pandas as pd
+
+
+class OHLCVDiskCache:
+    """
+    Parquet-backed store of prepared OHLCV history keyed by symbol and interval
+    """
+
+    def __init__(self, cache_dir):
+        """
+        Initialize the cache
+
+        Args:
+            cache_dir: Directory holding the cached files (created on demand)
+        """
+        self.cache_dir = cache_dir
+
+    def _base_path(self, symbol, interval):
+        """Path prefix for a symbol/interval pair (without extension)."""
+        safe_symbol = symbol.upper().replace('/', '_').replace('^', '_')
+        return os.path.join(self.cache_dir, f"{safe_symbol}_{interval}")
+
+    def load_meta(self, symbol, interval):
+        """
+        Read only the metadata of a cached entry
+
+        Args:
+            symbol: Trading symbol
+            interval: Data interval
+
+        Returns:
+            dict: Metadata as written by save(), or None if not cached
+        """
+        base = self._base_path(symbol, interval)
+        if not (os.path.exists(base + '.parquet') and os.path.exists(base + '.json')):
+            return None
+
+        try:
+            with open(base + '.json') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"Ignoring unreadable cache for {symbol} ({interval}): {str(e)}")
+            return None
+
+    def load(self, symbol, interval, columns=None):
+        """
+        Load cached history for a symbol
+
+        Args:
+            symbol: Trading symbol
+            interval: Data interval (e.g., '1d', '1wk')
+            columns: Columns to read (default: all); other columns are never
+                     read from the Parquet file, names not cached are skipped
+
+        Returns:
+            tuple: (DataFrame, metadata dict), or (None, None) if not cached
+        """
+        meta = self.load_meta(symbol, interval)
+        if meta is None:
+            return None, None
+
+        base = self._base_path(symbol, interval)
+        try:
+            if columns is not None and 'columns' in meta:
+                data = pd.read_parquet(base + '.parquet',
+                                       columns=[c for c in columns if c in meta['columns']])
+            else:
+                data = pd.read_parquet(base + '.parquet')
+                if columns is not None:
+                    data = data[[c for c in columns if c in data.columns]]
+        except Exception as e:
+            print(f"Ignoring unreadable cache for {symbol} ({interval}): {str(e)}")
+            return None, None
+
+        return data, meta
+
+    def save(self, symbol, interval, data, start=None):
+        """
+        Write history for a symbol, replacing any previous entry
+
+        Args:
+            symbol: Trading symbol
+            interval: Data interval
+            data: Prepared OHLCV DataFrame
+            start: Earliest date the download was asked for (None = full history)
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        base = self._base_path(symbol, interval)
+
+        meta = {
+            'symbol': symbol.upper(),
+            'interval': interval,
+            'start': start.isoformat() if start is not None else None,
+            'first_bar': data.index[0].isoformat() if len(data) else None,
+            'last_bar': data.index[-1].isoformat() if len(data) else None,
+            'rows': len(data),
+            'columns': [str(column) for column in data.columns],
+            'updated_at': datetime.now().astimezone().isoformat(),
+        }
+
+        # Write to temporary files first so a crash or a concurrent writer
+        # never leaves a torn entry
+        tmp = f".tmp{os.getpid()}_{threading.get_ident()}"
+        data.to_parquet(base + '.parquet' + tmp)
+        with open(base + '.json' + tmp, 'w') as f:
+            json.dump(meta, f, indent=2)
+        os.replace(base + '.parquet' + tmp, base + '.parquet')
+        os.replace(base + '.json' + tmp, base + '.json')
+
+        return meta
+
+    def covers(self, meta, start):
+        """
+        Check whether a cached entry reaches back far enough
+
+        Args:
+            meta: Metadata dict returned by load()
+            start: Requested start timestamp (None = full history)
+
+        Returns:
+            bool: True if the cache already holds everything from `start` on
+        """
+        if meta is None:
+            return False
+        if meta['start'] is None:
+            return True
+        if start is None:
+            return False
+        return pd.Timestamp(start).tz_localize(None) >= pd.Timestamp(meta['start']).tz_localize(None)
+
+    @staticmethod
+    def merge(cached, new):
+        """
+        Append freshly downloaded bars to cached history
+
+        Bars present in both frames are taken from `new`, so the last
+        (possibly still forming) cached bar is replaced by its updated version.
+
+        Args:
+            cached: Previously cached DataFrame
+            new: Newly downloaded DataFrame
+
+        Returns:
+            Combined DataFrame sorted by date
+        """
+        if cached is None or cached.empty:
+            return new
+        if new is None or new.empty:
+            return cached
+
+        combined = pd.concat([cached, new[cached.columns.intersection(new.columns)]])
+        combined = combined[~combined.index.duplicated(keep='last')]
+        return combined.sort_index()
@@ -0,0 +1,159 @@
+"""
+Concurrent fetch pool
+=====================
+
+Fetches a universe of symbols on a thread pool. Downloads are I/O bound, so
+threads overlap the network wait while a token bucket keeps the request rate
+under the provider's limits. Transient failures are retried with exponential
+backoff and every symbol gets a FetchResult describing what happened.
+"""
+
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class NoDataError(ValueError):
+    """Raised when a provider has no data for a symbol (not worth retrying)."""
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter
+    """
+
+    def __init__(self, rate, capacity=None):
+        """
+        Initialize the bucket
+
+        Args:
+            rate: Tokens added per second (sustained requests per second)
+            capacity: Maximum burst size (default: max(1, rate))
+        """
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available and take it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class FetchResult:
+    """Outcome of fetching one symbol."""
+
+    OK = 'ok'
+    NO_DATA = 'no_data'
+    FAILED = 'failed'
+    INVALID = 'invalid'
+
+    def __init__(self, symbol, status, data=None, attempts=0, error=None, elapsed=0.0):
+        self.symbol = symbol
+        self.status = status
+        self.data = data
+        self.attempts = attempts
+        self.error = error
+        self.elapsed = elapsed
+        self.quality = None
+
+    @property
+    def ok(self):
+        return self.status == self.OK
+
+    def __repr__(self):
+        rows = len(self.data) if self.data is not None else 0
+        return (f"FetchResult({self.symbol!r}, status={self.status!r}, rows={rows}, "
+                f"attempts={self.attempts}, error={self.error!r})")
+
+
+class FetchPool:
+    """
+    Bounded-concurrency fetcher with retries, backoff and rate limiting
+    """
+
+    def __init__(self, fetch, max_workers=8, max_retries=3, backoff=1.0,
+                 max_backoff=30.0, rate_limit=None, self_limited=False):
+        """
+        Initialize the pool
+
+        Args:
+            fetch: Callable taking a symbol and returning a DataFrame; it should
+                   raise on failure (NoDataError for symbols with no data)
+            max_workers: Maximum concurrent fetches
+            max_retries: Retries after the first failed attempt
+            backoff: Delay before the first retry in seconds (doubles each retry)
+            max_backoff: Upper bound for a single retry delay
+            rate_limit: Maximum requests per second across all workers (None = unlimited)
+            self_limited: `fetch` calls throttle() itself before each real
+                          request, so attempts served from a cache take no
+                          token; otherwise every attempt takes one
+        """
+        self.fetch = fetch
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.limiter = TokenBucket(rate_limit) if rate_limit else None
+        self.self_limited = self_limited
+
+    def throttle(self):
+        """Wait for a request token (returns at once without a rate limit)."""
+        if self.limiter is not None:
+            self.limiter.acquire()
+
+    def _fetch_one(self, symbol):
+        """Fetch a symbol with retries."""
+        started = time.monotonic()
+        error = None
+
+        for attempt in range(1, self.max_retries + 2):
+            if not self.self_limited:
+                self.throttle()
+            try:
+                data = self.fetch(symbol)
+            except NoDataError as e:
+                return FetchResult(symbol, FetchResult.NO_DATA, attempts=attempt,
+                                   error=str(e), elapsed=time.monotonic() - started)
+            except Exception as e:
+                error = str(e)
+            else:
+                if data is None or data.empty:
+                    return FetchResult(symbol, FetchResult.NO_DATA, attempts=attempt,
+                                       elapsed=time.monotonic() - started)
+                return FetchResult(symbol, FetchResult.OK, data=data, attempts=attempt,
+                                   elapsed=time.monotonic() - started)
+
+            if attempt <= self.max_retries:
+                # Full jitter keeps retrying workers from synchronizing
+                delay = min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+                time.sleep(random.uniform(0, delay))
+
+        return FetchResult(symbol, FetchResult.FAILED, attempts=self.max_retries + 1,
+                           error=error, elapsed=time.monotonic() - started)
+
+    def run(self, symbols):
+        """
+        Fetch all symbols
+
+        Args:
+            symbols: Iterable of trading symbols
+
+        Returns:
+            dict: Symbol -> FetchResult, in input order
+        """
+        symbols = list(dict.fromkeys(symbols))
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = list(executor.map(self._fetch_one, symbols))
+        return {result.symbol: result for result in results}
@@ -0,0 +1,107 @@
+"""
+Cache freshness policy
+======================
+
+Decides from the exchange calendar whether cached bars can still change.
+Outside trading hours nothing new is published, so a cache written after the
+last session closed, whose last bar falls in that session's day/week/month,
+is already final and can be served without a network call. During a session
+the forming bar keeps changing, so cached data is always stale then.
+"""
+
+from datetime import datetime
+
+import pandas as pd
+
+from data.market_calendar import (
+    EXCHANGE_TIMEZONE, SESSION_CLOSE, SESSION_OPEN, exchange_now, session_close_time,
+    trading_sessions
+)
+from data.resample import RESAMPLE_FREQUENCIES
+
+
+def last_closed_session(now=None, calendar='NYSE'):
+    """
+    Most recent session that has closed
+
+    Args:
+        now: Override for the current time (naive values are taken as exchange time)
+        calendar: 'NYSE' calendar name
+
+    Returns:
+        Tuple of (session date, tz-aware close timestamp)
+    """
+    now = exchange_now(now)
+    today = now.tz_localize(None).normalize()
+    sessions = trading_sessions(today - pd.Timedelta(days=14), today, calendar)
+    session = sessions[-1]
+    if session == today and now.time() < SESSION_CLOSE:
+        session = sessions[-2]
+    return session, session_close_time(session)
+
+
+def session_open(now=None, calendar='NYSE'):
+    """
+    Check whether the exchange is in its regular session
+
+    Args:
+        now: Override for the current time (naive values are taken as exchange time)
+        calendar: 'NYSE' calendar name
+
+    Returns:
+        bool: True between the open and the close of a session
+    """
+    now = exchange_now(now)
+    today = now.tz_localize(None).normalize()
+    sessions = trading_sessions(today, today, calendar)
+    return len(sessions) > 0 and SESSION_OPEN <= now.time() < SESSION_CLOSE
+
+
+def fetched_at(meta):
+    """
+    Time a cache entry was written, in exchange time
+
+    Args:
+        meta: Cache metadata with an 'updated_at' ISO timestamp (naive values
+              are taken as local time)
+
+    Returns:
+        Timezone-aware pandas.Timestamp, or None if unknown
+    """
+    if not meta or not meta.get('updated_at'):
+        return None
+    written = datetime.fromisoformat(meta['updated_at']).astimezone()
+    return pd.Timestamp(written).tz_convert(EXCHANGE_TIMEZONE)
+
+
+def is_fresh(meta, interval, now=None, calendar='NYSE'):
+    """
+    Check whether cached bars already include everything the provider has
+
+    Args:
+        meta: Cache metadata (needs 'updated_at' and 'last_bar')
+        interval: Data interval of the cached bars
+        now: Override for the current time
+        calendar: 'NYSE', or None/'' to treat every cache as stale (assets
+                  that trade around the clock)
+
+    Returns:
+        bool: True if refetching cannot return anything new
+    """
+    if not calendar or not meta or not meta.get('last_bar'):
+        return False
+    if session_open(now, calendar):
+        return False
+
+    written = fetched_at(meta)
+    session, close = last_closed_session(now, calendar)
+    if written is None or written < close:
+        return False
+
+    # The provider may publish the closing bar late; only trust a cache whose
+    # last bar already belongs to the last session's day/week/month
+    frequency = RESAMPLE_FREQUENCIES.get(interval, 'D')
+    last_bar = pd.Timestamp(meta['last_bar'])
+    if last_bar.tzinfo is not None:
+        last_bar = last_bar.tz_convert(EXCHANGE_TIMEZONE).tz_localize(None)
+    return last_bar.to_period(frequency) >= session.to_period(frequency)
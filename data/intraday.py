@@ -0,0 +1,154 @@
+"""
+Intraday history assembler
+==========================
+
+yfinance only serves intraday bars for a limited look-back (30 days of 1m,
+60 days of 2m-90m, 730 days of hourly) and caps the span of each request,
+so a single download silently returns a truncated history. The assembler
+fetches intraday bars in windows the provider accepts, de-duplicates the
+overlaps, and appends them to the persistent cache, so history keeps
+accumulating beyond the provider's look-back across runs.
+"""
+
+from datetime import datetime
+
+import pandas as pd
+
+from data.disk_cache import OHLCVDiskCache
+from data.freshness import is_fresh
+
+
+class IntradayAssembler:
+    """
+    Builds and extends intraday history for a DataHandler
+    """
+
+    def __init__(self, handler):
+        """
+        Initialize the assembler
+
+        Args:
+            handler: DataHandler whose provider and persistent cache are used
+        """
+        self.handler = handler
+
+    def limits(self, interval):
+        """
+        Provider limits for an interval
+
+        Returns:
+            tuple: (max days per request, max days of look-back), None where unlimited
+        """
+        limits = getattr(self.handler.provider, 'intraday_limits', None) or {}
+        return limits.get(interval, (None, None))
+
+    @staticmethod
+    def windows(start, end, max_days):
+        """
+        Split [start, end) into request windows of at most max_days
+
+        Args:
+            start: First day (tz-naive)
+            end: Day after the last one (tz-naive)
+            max_days: Window length in days (None = one window)
+
+        Returns:
+            list of (start, end) 'YYYY-MM-DD' string pairs
+        """
+        if max_days is None:
+            return [(start.strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d'))]
+
+        bounds = list(pd.date_range(start, end, freq=f'{max_days}D'))
+        if bounds[-1] < end:
+            bounds.append(end)
+        return [(a.strftime('%Y-%m-%d'), b.strftime('%Y-%m-%d'))
+                for a, b in zip(bounds[:-1], bounds[1:])]
+
+    def assemble(self, symbol, interval, start=None, now=None):
+        """
+        Get intraday history, fetching only what is missing
+
+        With a persistent cache, fetching resumes at the last cached session
+        (which is re-fetched in case it was cached mid-session), and days
+        before the first cached one are back-filled when `start` asks for
+        them. Without a cache, the requested range is fetched in windows.
+        Requests never reach further back than the provider's look-back
+        limit; if the cache is older than that, the unrecoverable gap is
+        reported.
+
+        Args:
+            symbol: Trading symbol
+            interval: Intraday interval (e.g., '5m', '1h')
+            start: Earliest day wanted (default: as far back as the provider
+                   allows)
+            now: Override for the current day
+
+        Returns:
+            Prepared DataFrame of all accumulated bars, or None if nothing was found
+        """
+        handler = self.handler
+        disk_cache = handler.disk_cache
+        per_request, look_back = self.limits(interval)
+
+        today = pd.Timestamp(now or datetime.now()).normalize()
+        end = today + pd.Timedelta(days=1)
+        earliest = today - pd.Timedelta(days=look_back) if look_back else None
+        wanted = pd.Timestamp(start).tz_localize(None).normalize() if start is not None else earliest
+        if earliest is not None and wanted is not None and wanted < earliest:
+            wanted = earliest
+
+        cached, meta = disk_cache.load(symbol, interval) if disk_cache is not None else (None, None)
+        if cached is not None and not len(cached):
+            cached = None
+
+        # [from, to) day ranges to fetch
+        ranges = []
+        if cached is not None:
+            covered = pd.Timestamp(meta['start']).tz_localize(None).normalize() if meta['start'] \
+                else cached.index[0].tz_localize(None).normalize()
+            first = covered
+            if wanted is not None and wanted < covered:
+                ranges.append((wanted, covered))
+                first = wanted
+
+            if not is_fresh(meta, interval, now, handler.calendar_for(symbol)):
+                fetch_from = cached.index[-1].tz_localize(None).normalize()
+                if earliest is not None and fetch_from < earliest:
+                    print(f"Gap in {symbol} ({interval}) history: "
+                          f"{fetch_from.date()} to {earliest.date()} is no longer available")
+                    fetch_from = earliest
+                ranges.append((fetch_from, end))
+
+            if not ranges:
+                return cached
+        else:
+            first = wanted
+            if wanted is not None:
+                ranges.append((wanted, end))
+
+        if not ranges:
+            raw = handler.fetch_data(symbol, 'max', interval)
+            new = handler.prepare_data(raw) if raw is not None else None
+        else:
+            frames = []
+            for range_start, range_end in ranges:
+                for window_start, window_end in self.windows(range_start, range_end, per_request):
+                    raw = handler.fetch_data(symbol, interval=interval,
+                                             start_date=window_start, end_date=window_end)
+                    if raw is not None:
+                        frames.append(handler.prepare_data(raw))
+            new = None
+            if frames:
+                new = pd.concat(frames)
+                new = new[~new.index.duplicated(keep='last')].sort_index()
+
+        data = OHLCVDiskCache.merge(cached, new)
+        if data is None or data.empty:
+            return None
+
+        if disk_cache is not None and new is not None:
+            if first is None:
+                first = data.index[0].tz_localize(None).normalize()
+            disk_cache.save(symbol, interval, data, start=first)
+
+        return data
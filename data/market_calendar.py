@@ -0,0 +1,149 @@
+"""
+Exchange calendar helpers
+=========================
+
+NYSE trading sessions built on pandas' holiday machinery. Used to decide
+when a weekly or monthly bar is complete and when a session has closed.
+
+Only regular holidays are modelled; one-off closures (e.g., national days of
+mourning) and early closes are not.
+"""
+
+from datetime import time
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+from pandas.tseries.holiday import (
+    AbstractHolidayCalendar, Holiday, GoodFriday, USMartinLutherKingJr,
+    USPresidentsDay, USMemorialDay, USLaborDay, USThanksgivingDay,
+    nearest_workday, sunday_to_monday
+)
+from pandas.tseries.offsets import CustomBusinessDay
+
+
+EXCHANGE_TIMEZONE = 'America/New_York'
+SESSION_OPEN = time(9, 30)
+SESSION_CLOSE = time(16, 0)
+
+
+class NYSEHolidayCalendar(AbstractHolidayCalendar):
+    """
+    Regular NYSE holidays
+    """
+    rules = [
+        Holiday('New Years Day', month=1, day=1, observance=sunday_to_monday),
+        USMartinLutherKingJr,
+        USPresidentsDay,
+        GoodFriday,
+        USMemorialDay,
+        Holiday('Juneteenth', month=6, day=19, start_date='2022-01-01',
+                observance=nearest_workday),
+        Holiday('Independence Day', month=7, day=4, observance=nearest_workday),
+        USLaborDay,
+        USThanksgivingDay,
+        Holiday('Christmas', month=12, day=25, observance=nearest_workday),
+    ]
+
+
+NYSE_SESSION = CustomBusinessDay(calendar=NYSEHolidayCalendar())
+
+
+# Yahoo-style suffixes of symbols that trade outside exchange sessions:
+# crypto pairs (BTC-USD, ETH-EUR, ...), FX (EURUSD=X) and futures (ES=F)
+ROUND_THE_CLOCK_SUFFIXES = ('-USD', '-USDT', '-USDC', '-EUR', '-GBP', '-JPY', '-BTC', '-ETH',
+                            '=X', '=F')
+
+
+def symbol_calendar(symbol, calendar='NYSE'):
+    """
+    Calendar that applies to a symbol
+
+    Args:
+        symbol: Trading symbol
+        calendar: Calendar of exchange-listed symbols ('NYSE', or None/'')
+
+    Returns:
+        `calendar`, or None for symbols that trade around the clock
+    """
+    if not calendar or symbol.upper().endswith(ROUND_THE_CLOCK_SUFFIXES):
+        return None
+    return calendar
+
+
+def trading_sessions(start, end, calendar='NYSE'):
+    """
+    Session dates between two dates (inclusive)
+
+    Args:
+        start: First date
+        end: Last date
+        calendar: 'NYSE', or None for assets that trade every day
+
+    Returns:
+        pandas.DatetimeIndex of session dates
+    """
+    return _trading_sessions(pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize(), calendar)
+
+
+@lru_cache(maxsize=64)
+def _trading_sessions(start, end, calendar):
+    """Cached session range (CustomBusinessDay ranges are slow to build)."""
+    if calendar is None:
+        return pd.date_range(start, end, freq='D')
+    return pd.date_range(start, end, freq=NYSE_SESSION)
+
+
+def last_sessions(period_ends, calendar='NYSE'):
+    """
+    Last session on or before each date (vectorized)
+
+    Args:
+        period_ends: DatetimeIndex of (tz-naive) dates
+        calendar: 'NYSE', or None for assets that trade every day
+
+    Returns:
+        pandas.DatetimeIndex of session dates
+    """
+    period_ends = pd.DatetimeIndex(period_ends).normalize()
+    if calendar is None or len(period_ends) == 0:
+        return period_ends
+
+    sessions = trading_sessions(period_ends.min() - pd.Timedelta(days=14),
+                                period_ends.max(), calendar)
+    # Compare in one resolution: asi8 counts in each index's own unit
+    positions = np.searchsorted(sessions.values.astype('datetime64[ns]'),
+                                period_ends.values.astype('datetime64[ns]'), side='right') - 1
+    return sessions[positions]
+
+
+def session_close_time(session_date):
+    """
+    Closing timestamp of a session in exchange time
+
+    Args:
+        session_date: Session date
+
+    Returns:
+        Timezone-aware pandas.Timestamp
+    """
+    day = pd.Timestamp(session_date).tz_localize(None).normalize()
+    return pd.Timestamp.combine(day.date(), SESSION_CLOSE).tz_localize(EXCHANGE_TIMEZONE)
+
+
+def exchange_now(now=None):
+    """
+    Current time in the exchange timezone
+
+    Args:
+        now: Override for the current time (naive values are taken as exchange time)
+
+    Returns:
+        Timezone-aware pandas.Timestamp
+    """
+    if now is None:
+        return pd.Timestamp.now(tz=EXCHANGE_TIMEZONE)
+    now = pd.Timestamp(now)
+    if now.tzinfo is None:
+        return now.tz_localize(EXCHANGE_TIMEZONE)
+    return now.tz_convert(EXCHANGE_TIMEZONE)
@@ -0,0 +1,171 @@
+"""
+In-memory frame cache
+=====================
+
+Bounded LRU cache for prepared OHLCV frames. Entries are evicted by their
+in-memory byte size rather than by count, so one 'max' daily history and a
+handful of short weekly series are budgeted fairly. Cached frames are handed
+out detached from the stored copy: a cheap shallow copy when pandas
+copy-on-write is active, a deep copy otherwise.
+
+Each entry remembers when it was stored, and get() can be given a
+freshness check so long-running processes do not serve a frame forever.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+
+
+def copy_on_write_enabled():
+    """
+    Check whether pandas copy-on-write semantics are active
+
+    Returns:
+        bool: True on pandas >= 3.0 or when mode.copy_on_write is enabled
+    """
+    if int(pd.__version__.split('.')[0]) >= 3:
+        return True
+    try:
+        return pd.get_option('mode.copy_on_write') is True
+    except Exception:
+        return False
+
+
+def frame_nbytes(frame):
+    """
+    Memory footprint of a DataFrame including its index
+
+    Args:
+        frame: DataFrame
+
+    Returns:
+        int: Size in bytes
+    """
+    return int(frame.memory_usage(index=True, deep=True).sum())
+
+
+class FrameLRUCache:
+    """
+    Thread-safe LRU cache of DataFrames bounded by total byte size
+    """
+
+    def __init__(self, max_bytes=256 * 1024 ** 2):
+        """
+        Initialize the cache
+
+        Args:
+            max_bytes: Memory budget for all cached frames
+        """
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expired = 0
+
+    @staticmethod
+    def _detach(frame):
+        """Copy a frame so callers cannot mutate the cached version."""
+        return frame.copy(deep=not copy_on_write_enabled())
+
+    def get(self, key, fresh=None, detach=True):
+        """
+        Look up a cached frame
+
+        Args:
+            key: Hashable cache key
+            fresh: Optional check fresh(frame, stored_at) -> bool, with
+                   stored_at in seconds since the epoch; an entry failing it
+                   is dropped and counted as a miss
+            detach: Return a copy (False hands out the stored frame itself,
+                    for callers that only read or slice-and-copy it)
+
+        Returns:
+            DataFrame, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and fresh is not None and not fresh(entry[0], entry[2]):
+            with self._lock:
+                if self._entries.get(key) is entry:
+                    self._bytes -= self._entries.pop(key)[1]
+                    self.expired += 1
+            entry = None
+
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            if key in self._entries:
+                self._entries.move_to_end(key)
+            self.hits += 1
+            frame = entry[0]
+
+        return self._detach(frame) if detach else frame
+
+    def put(self, key, frame):
+        """
+        Store a frame, evicting least recently used entries over budget
+
+        Frames larger than the whole budget are not cached.
+
+        Args:
+            key: Hashable cache key
+            frame: DataFrame to cache
+        """
+        if frame is None:
+            return
+
+        size = frame_nbytes(frame)
+        if size > self.max_bytes:
+            return
+
+        stored = self._detach(frame)
+
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (stored, size, time.time())
+            self._bytes += size
+
+            while self._bytes > self.max_bytes:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        """Drop all entries (statistics are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def stats(self):
+        """
+        Cache statistics
+
+        Returns:
+            dict: hits, misses, evictions, expired, entries, bytes and max_bytes
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expired': self.expired,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+            }
@@ -0,0 +1,231 @@
+"""
+Memory-mapped column store
+==========================
+
+Columnar on-disk layout for large universes: one .npy file per column per
+symbol and interval, opened with numpy memory mapping. Frames returned by
+read() are zero-copy views over the mapped files, so any number of worker
+processes reading the same symbol share one page-cached copy instead of each
+unpickling its own DataFrame.
+
+Layout:
+    root/index.json                            symbol -> interval -> rows/first/last
+    root/SYMBOL/INTERVAL/meta.json             version, columns, dtypes, timezone
+    root/SYMBOL/INTERVAL/VERSION/index.npy     int64 nanoseconds since epoch (UTC)
+    root/SYMBOL/INTERVAL/VERSION/<col>.npy     one array per column
+
+Every write goes to a new VERSION directory, and meta.json, which names the
+current version, is replaced last in one atomic rename. A reader resolves
+the version once and maps all arrays from it, so a concurrent rewrite never
+hands it arrays of different lengths. The previous version is kept for
+readers still opening it; older ones are removed.
+"""
+
+import json
+import os
+import shutil
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+
+class MmapColumnStore:
+    """
+    Store of per-column memory-mapped arrays keyed by symbol and interval
+    """
+
+    def __init__(self, root):
+        """
+        Initialize the store
+
+        Args:
+            root: Directory holding the store (created on demand)
+        """
+        self.root = root
+        self._lock = threading.Lock()
+
+    def _dir(self, symbol, interval):
+        safe_symbol = symbol.upper().replace('/', '_').replace('^', '_')
+        return os.path.join(self.root, safe_symbol, interval)
+
+    @staticmethod
+    def _file_name(column):
+        return str(column).replace(' ', '_').replace('/', '_') + '.npy'
+
+    def _version_dir(self, symbol, interval, meta):
+        """Directory holding the arrays of a stored version."""
+        directory = self._dir(symbol, interval)
+        # Stores written before versioning keep their arrays next to meta.json
+        return os.path.join(directory, meta['version']) if meta.get('version') else directory
+
+    @staticmethod
+    def _write_array(path, array):
+        with open(path, 'wb') as f:
+            np.save(f, np.ascontiguousarray(array))
+
+    def write(self, symbol, interval, data):
+        """
+        Write a prepared OHLCV frame
+
+        Args:
+            symbol: Trading symbol
+            interval: Data interval
+            data: DataFrame with a DatetimeIndex and numeric/bool columns
+        """
+        directory = self._dir(symbol, interval)
+        previous = self.meta(symbol, interval)
+        version = f"v{time.time_ns()}_{os.getpid()}_{threading.get_ident()}"
+        version_dir = os.path.join(directory, version)
+        os.makedirs(version_dir)
+
+        index = data.index
+        tz = str(index.tz) if index.tz is not None else None
+        utc_index = index.tz_convert('UTC').tz_localize(None) if tz else index
+        self._write_array(os.path.join(version_dir, 'index.npy'),
+                          np.asarray(utc_index, dtype='datetime64[ns]').view('int64'))
+
+        columns = []
+        for column in data.columns:
+            values = data[column].to_numpy()
+            file_name = self._file_name(column)
+            self._write_array(os.path.join(version_dir, file_name), values)
+            columns.append({'name': column, 'file': file_name, 'dtype': str(values.dtype)})
+
+        meta = {
+            'symbol': symbol.upper(),
+            'interval': interval,
+            'version': version,
+            'rows': len(data),
+            'tz': tz,
+            'index_name': index.name,
+            'columns_name': data.columns.name,
+            'columns': columns,
+        }
+        path = os.path.join(directory, 'meta.json')
+        tmp = f"{path}.tmp{os.getpid()}_{threading.get_ident()}"
+        with open(tmp, 'w') as f:
+            json.dump(meta, f, indent=2)
+        os.replace(tmp, path)
+
+        keep = {version, previous.get('version') if previous else None}
+        self._prune(directory, keep)
+        self._update_index(symbol, interval, data)
+
+    @staticmethod
+    def _prune(directory, keep):
+        """Remove versions not in `keep` and arrays of the unversioned layout."""
+        for entry in os.listdir(directory):
+            path = os.path.join(directory, entry)
+            if entry in keep:
+                continue
+            if entry.startswith('v') and os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+            elif entry.endswith('.npy'):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def _update_index(self, symbol, interval, data):
+        """Record a symbol/interval in the top-level index."""
+        with self._lock:
+            index = self.index()
+            index.setdefault(symbol.upper(), {})[interval] = {
+                'rows': len(data),
+                'first': data.index[0].isoformat() if len(data) else None,
+                'last': data.index[-1].isoformat() if len(data) else None,
+            }
+            path = os.path.join(self.root, 'index.json')
+            tmp = f"{path}.tmp{os.getpid()}_{threading.get_ident()}"
+            with open(tmp, 'w') as f:
+                json.dump(index, f, indent=2)
+            os.replace(tmp, path)
+
+    def index(self):
+        """
+        Top-level index of stored series
+
+        Returns:
+            dict: Symbol -> interval -> {'rows', 'first', 'last'}
+        """
+        path = os.path.join(self.root, 'index.json')
+        if not os.path.exists(path):
+            return {}
+        with open(path) as f:
+            return json.load(f)
+
+    def contains(self, symbol, interval):
+        """Check whether a symbol/interval pair is stored."""
+        return os.path.exists(os.path.join(self._dir(symbol, interval), 'meta.json'))
+
+    def meta(self, symbol, interval):
+        """Metadata of a stored series (None if not stored)."""
+        path = os.path.join(self._dir(symbol, interval), 'meta.json')
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def arrays(self, symbol, interval, columns=None, meta=None):
+        """
+        Memory-mapped, read-only arrays for a stored series
+
+        Args:
+            symbol: Trading symbol
+            interval: Data interval
+            columns: Column names to map (default: all)
+            meta: Metadata already read for this series (default: read it now)
+
+        Returns:
+            dict: 'index' (int64 ns UTC) and one array per column, or None if not stored
+        """
+        if meta is None:
+            meta = self.meta(symbol, interval)
+        if meta is None:
+            return None
+
+        directory = self._version_dir(symbol, interval, meta)
+        available = {column['name']: column['file'] for column in meta['columns']}
+        wanted = list(available) if columns is None else list(columns)
+
+        missing = [column for column in wanted if column not in available]
+        if missing:
+            raise KeyError(f"Columns {missing} not stored for {symbol} ({interval})")
+
+        arrays = {'index': np.load(os.path.join(directory, 'index.npy'), mmap_mode='r')}
+        for column in wanted:
+            arrays[column] = np.load(os.path.join(directory, available[column]), mmap_mode='r')
+        return arrays
+
+    def read(self, symbol, interval, columns=None):
+        """
+        Zero-copy DataFrame view over a stored series
+
+        The column data stays in the mapped files; the frame is read-only, so
+        in-place edits raise while adding new columns works as usual.
+
+        Args:
+            symbol: Trading symbol
+            interval: Data interval
+            columns: Column names to load (default: all)
+
+        Returns:
+            DataFrame, or None if not stored
+        """
+        meta = self.meta(symbol, interval)
+        if meta is None:
+            return None
+        arrays = self.arrays(symbol, interval, columns, meta)
+
+        index = pd.DatetimeIndex(arrays.pop('index').view('datetime64[ns]'), name=meta['index_name'])
+        if meta['tz']:
+            index = index.tz_localize('UTC').tz_convert(meta['tz'])
+
+        data = pd.DataFrame(
+            {column: pd.Series(values, index=index, copy=False) for column, values in arrays.items()},
+            copy=False,
+        )
+        data.columns.name = meta['columns_name']
+        return data
@@ -0,0 +1,428 @@
+"""
+Data providers
+==============
+
+Pluggable OHLCV sources behind DataHandler. Every provider returns frames
+shaped like yf.download output (Price/Ticker MultiIndex columns, DatetimeIndex)
+so the rest of the data layer does not care where the bars came from.
+
+Providers:
+- YFinanceProvider: Yahoo Finance via yfinance (network)
+- LocalDirectoryProvider: Parquet/CSV files in a directory (offline)
+- SyntheticProvider: Deterministic random-walk bars (offline, repeatable)
+
+Select one with DATA_PARAMS['provider'] in config.py.
+"""
+
+import abc
+import os
+import threading
+import zlib
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from data.fetch_pool import NoDataError
+
+
+OHLCV_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+INTRADAY_MINUTES = {
+    '1m': 1, '2m': 2, '5m': 5, '15m': 15, '30m': 30,
+    '60m': 60, '90m': 90, '1h': 60,
+}
+
+
+def period_start(period, end=None):
+    """
+    Convert a yfinance period string into the first date it covers
+
+    Args:
+        period: Period string (e.g., '5d', '6mo', '2y', 'ytd', 'max')
+        end: Reference end date (default: now)
+
+    Returns:
+        pandas.Timestamp, or None for 'max'
+    """
+    end = pd.Timestamp(end or datetime.now()).normalize()
+
+    if period == 'max':
+        return None
+    if period == 'ytd':
+        return pd.Timestamp(year=end.year, month=1, day=1)
+    if period.endswith('mo'):
+        return end - pd.DateOffset(months=int(period[:-2]))
+    if period.endswith('y'):
+        return end - pd.DateOffset(years=int(period[:-1]))
+    if period.endswith('d'):
+        return end - pd.DateOffset(days=int(period[:-1]))
+
+    raise ValueError(f"Unsupported period: {period}")
+
+
+def _window(data, period, start_date, end_date):
+    """Restrict a frame to a period or [start_date, end_date) window."""
+    index = data.index
+    if start_date:
+        start = pd.Timestamp(start_date)
+    else:
+        start = period_start(period)
+    end = pd.Timestamp(end_date) if end_date else None
+
+    if getattr(index, 'tz', None) is not None:
+        start = start.tz_localize(index.tz) if start is not None and start.tzinfo is None else start
+        end = end.tz_localize(index.tz) if end is not None and end.tzinfo is None else end
+
+    if start is not None:
+        data = data[data.index >= start]
+    if end is not None:
+        data = data[data.index < end]
+    return data
+
+
+def _as_download(frames):
+    """Combine per-symbol frames into yf.download-shaped output."""
+    frames = {symbol: frame for symbol, frame in frames.items() if frame is not None and not frame.empty}
+    if not frames:
+        return pd.DataFrame()
+
+    data = pd.concat(frames, axis=1)
+    data = data.swaplevel(0, 1, axis=1).sort_index(axis=1, level=0, sort_remaining=False)
+    data.columns.names = ['Price', 'Ticker']
+    return data
+
+
+class DataProvider(abc.ABC):
+    """
+    Base class for OHLCV data sources
+    """
+
+    name = 'base'
+
+    # Whether downloads are worth keeping in the persistent cache
+    cacheable = False
+
+    @property
+    def cache_namespace(self):
+        """
+        Name under which this provider's bars are cached
+
+        Providers whose output depends on their configuration include it,
+        so differently configured instances never share cache entries.
+        Used in memory cache keys and as a directory name.
+        """
+        return self.name
+
+    @abc.abstractmethod
+    def download(self, symbols, period='2y', interval='1d', start_date=None, end_date=None):
+        """
+        Download OHLCV bars
+
+        Args:
+            symbols: Symbol or list of symbols
+            period: Period to fetch (ignored if start_date is given)
+            interval: Data interval
+            start_date: Start date (optional)
+            end_date: End date, exclusive (optional)
+
+        Returns:
+            DataFrame shaped like yf.download output (empty if nothing found)
+        """
+
+
+def _is_missing_data(error):
+    """Check whether a yfinance exception means the symbol has no data."""
+    try:
+        from yfinance.exceptions import YFTickerMissingError
+    except ImportError:  # yfinance < 0.2.40 raises plain Exceptions
+        YFTickerMissingError = ()
+    if isinstance(error, YFTickerMissingError):
+        return True
+    message = str(error).lower()
+    return 'no data found' in message or 'delisted' in message
+
+
+class YFinanceProvider(DataProvider):
+    """
+    Yahoo Finance via yfinance
+
+    yf.download keeps per-call state in module globals, so concurrent calls
+    can clobber each other. Single symbols are therefore fetched with
+    Ticker.history (safe to call from several threads) and reshaped like
+    yf.download output; multi-ticker downloads are serialized.
+
+    Both paths request split/dividend-adjusted prices explicitly: the
+    yf.download default changed between yfinance versions, and mixing
+    adjusted and unadjusted bars in one cache would look like re-adjusted
+    history on every tail refresh.
+    """
+
+    name = 'yfinance'
+    cacheable = True
+
+    # Interval -> (max days per request, max days of look-back)
+    intraday_limits = {
+        '1m': (7, 29),
+        '2m': (59, 59), '5m': (59, 59), '15m': (59, 59), '30m': (59, 59), '90m': (59, 59),
+        '60m': (729, 729), '1h': (729, 729),
+    }
+
+    _download_lock = threading.Lock()
+
+    def download(self, symbols, period='2y', interval='1d', start_date=None, end_date=None):
+        import yfinance as yf
+
+        if start_date:
+            window = {'start': start_date, 'end': end_date}
+        else:
+            window = {'period': period}
+
+        if isinstance(symbols, (list, tuple)):
+            with self._download_lock:
+                return yf.download(list(symbols), interval=interval, group_by='column',
+                                   auto_adjust=True, **window)
+
+        try:
+            data = yf.Ticker(symbols).history(interval=interval, actions=False, auto_adjust=True,
+                                              raise_errors=True, **window)
+        except Exception as e:
+            if _is_missing_data(e):
+                raise NoDataError(f"No data found for symbol {symbols}: {e}") from e
+            raise
+        if data.empty:
+            return data
+
+        # yf.download drops the timezone of daily and longer bars
+        if interval not in INTRADAY_MINUTES:
+            data.index = data.index.tz_localize(None)
+            data.index.name = 'Date'
+        return _as_download({symbols: data[[col for col in OHLCV_COLUMNS if col in data.columns]]})
+
+
+class LocalDirectoryProvider(DataProvider):
+    """
+    OHLCV files in a local directory
+
+    Files are named {SYMBOL}_{interval}.parquet or {SYMBOL}_{interval}.csv
+    (e.g., AAPL_1d.parquet) with a date index or a leading date column and at
+    least Open/High/Low/Close/Volume columns.
+    """
+
+    name = 'local'
+
+    def __init__(self, root, file_format='parquet'):
+        """
+        Initialize the provider
+
+        Args:
+            root: Directory holding the files
+            file_format: Preferred format, 'parquet' or 'csv' (the other is
+                         used as a fallback when a file is missing)
+        """
+        if file_format not in ('parquet', 'csv'):
+            raise ValueError(f"Unsupported file format: {file_format}")
+        self.root = root
+        self.file_format = file_format
+
+    @property
+    def cache_namespace(self):
+        root = os.path.abspath(self.root).encode()
+        return f"{self.name}-{zlib.crc32(root):08x}-{self.file_format}"
+
+    def path(self, symbol, interval, file_format=None):
+        """Path of the file for a symbol/interval pair."""
+        ext = file_format or self.file_format
+        return os.path.join(self.root, f"{symbol.upper()}_{interval}.{ext}")
+
+    def read(self, symbol, interval):
+        """
+        Read the full file for a symbol
+
+        Returns:
+            DataFrame, or None if no file exists
+        """
+        formats = [self.file_format] + [f for f in ('parquet', 'csv') if f != self.file_format]
+        for file_format in formats:
+            path = self.path(symbol, interval, file_format)
+            if not os.path.exists(path):
+                continue
+            if file_format == 'parquet':
+                data = pd.read_parquet(path)
+            else:
+                data = pd.read_csv(path, index_col=0, parse_dates=True)
+            if not isinstance(data.index, pd.DatetimeIndex):
+                data.index = pd.to_datetime(data.index)
+            return data.sort_index()
+        return None
+
+    def download(self, symbols, period='2y', interval='1d', start_date=None, end_date=None):
+        symbol_list = list(symbols) if isinstance(symbols, (list, tuple)) else [symbols]
+
+        frames = {}
+        for symbol in symbol_list:
+            data = self.read(symbol, interval)
+            if data is not None:
+                frames[symbol] = _window(data, period, start_date, end_date)
+        return _as_download(frames)
+
+
+class SyntheticProvider(DataProvider):
+    """
+    Deterministic synthetic OHLCV bars
+
+    Daily bars are a geometric random walk on the NYSE session calendar,
+    seeded from the symbol and `seed`, so the same symbol always produces the
+    same history. Weekly/monthly bars are resampled from the daily ones and
+    intraday bars are generated per session between that day's open and close.
+    """
+
+    name = 'synthetic'
+
+    def __init__(self, seed=42, start='1990-01-02', end=None):
+        """
+        Initialize the provider
+
+        Args:
+            seed: Base random seed
+            start: First session of the generated history
+            end: Last session (default: today)
+        """
+        self.seed = seed
+        self.start = pd.Timestamp(start)
+        self.end = pd.Timestamp(end or datetime.now()).normalize()
+
+    @property
+    def cache_namespace(self):
+        return f"{self.name}-{self.seed}-{self.start:%Y%m%d}-{self.end:%Y%m%d}"
+
+    def _rng(self, *parts):
+        """Random generator seeded from the provider seed and `parts`."""
+        key = ':'.join(str(part) for part in parts).encode()
+        return np.random.default_rng([self.seed, zlib.crc32(key)])
+
+    def daily(self, symbol):
+        """
+        Full daily history for a symbol
+
+        Returns:
+            DataFrame with Open/High/Low/Close/Adj Close/Volume columns
+        """
+        from data.market_calendar import trading_sessions
+
+        index = trading_sessions(self.start, self.end)
+        rng = self._rng(symbol.upper())
+        n = len(index)
+
+        start_price = 20 + 180 * rng.random()
+        log_returns = rng.normal(0.0003, 0.018, n)
+        close = start_price * np.exp(np.cumsum(log_returns))
+        open_ = np.r_[start_price, close[:-1]] * np.exp(rng.normal(0, 0.004, n))
+        high = np.maximum(open_, close) * np.exp(np.abs(rng.normal(0, 0.008, n)))
+        low = np.minimum(open_, close) * np.exp(-np.abs(rng.normal(0, 0.008, n)))
+        volume = rng.integers(1_000_000, 50_000_000, n)
+
+        return pd.DataFrame({
+            'Open': open_, 'High': high, 'Low': low, 'Close': close,
+            'Adj Close': close, 'Volume': volume.astype(float),
+        }, index=pd.DatetimeIndex(index, name='Date'))
+
+    def intraday(self, symbol, interval, start, end):
+        """
+        Intraday bars for the sessions in [start, end)
+
+        Each session is a Brownian bridge from the daily open to the daily
+        close, seeded per symbol and day, so any window is reproducible.
+
+        Returns:
+            DataFrame indexed by exchange-time bar start
+        """
+        from data.market_calendar import EXCHANGE_TIMEZONE
+
+        minutes = INTRADAY_MINUTES[interval]
+        daily = self.daily(symbol)
+        daily = daily[(daily.index >= start.normalize()) & (daily.index < end)]
+
+        steps = int(np.ceil(390 / minutes))
+        offsets = pd.to_timedelta(570 + minutes * np.arange(steps), unit='m')
+
+        frames = []
+        for day, bar in daily.iterrows():
+            rng = self._rng(symbol.upper(), interval, day.strftime('%Y%m%d'))
+            walk = np.cumsum(rng.normal(0, 1, steps + 1))
+            bridge = walk - np.linspace(0, 1, steps + 1) * walk[-1]
+            path = np.linspace(np.log(bar['Open']), np.log(bar['Close']), steps + 1) + \
+                0.002 * bridge
+            prices = np.exp(path)
+            open_, close = prices[:-1], prices[1:]
+            high = np.minimum(np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.0005, steps))),
+                              bar['High'])
+            low = np.maximum(np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.0005, steps))),
+                             bar['Low'])
+            volume = np.round(rng.dirichlet(np.ones(steps)) * bar['Volume'])
+            frames.append(pd.DataFrame({
+                'Open': open_, 'High': high, 'Low': low, 'Close': close,
+                'Adj Close': close, 'Volume': volume,
+            }, index=(day + offsets)))
+
+        if not frames:
+            return pd.DataFrame(columns=OHLCV_COLUMNS)
+
+        data = pd.concat(frames)
+        data.index = pd.DatetimeIndex(data.index, name='Datetime').tz_localize(EXCHANGE_TIMEZONE)
+        return data
+
+    def download(self, symbols, period='2y', interval='1d', start_date=None, end_date=None):
+        from data.resample import RESAMPLE_FREQUENCIES, resample_ohlcv
+
+        symbol_list = list(symbols) if isinstance(symbols, (list, tuple)) else [symbols]
+
+        frames = {}
+        for symbol in symbol_list:
+            if interval in INTRADAY_MINUTES:
+                start = pd.Timestamp(start_date) if start_date else period_start(period, self.end)
+                end = pd.Timestamp(end_date) if end_date else self.end + pd.Timedelta(days=1)
+                if start is None:
+                    start = self.end - pd.Timedelta(days=60)
+                data = self.intraday(symbol, interval, start, end)
+            else:
+                data = self.daily(symbol)
+                if interval in RESAMPLE_FREQUENCIES:
+                    data = resample_ohlcv(data, interval).drop(columns='bar_complete')
+                elif interval != '1d':
+                    raise ValueError(f"Synthetic provider does not support interval {interval}")
+            frames[symbol] = _window(data, period, start_date, end_date)
+        return _as_download(frames)
+
+
+def create_provider(name=None, **options):
+    """
+    Build a data provider
+
+    Args:
+        name: 'yfinance', 'local' or 'synthetic' (default: DATA_PARAMS['provider'])
+        **options: Provider options; missing ones are read from DATA_PARAMS
+                   ('provider_dir' and 'provider_format' for local,
+                   'synthetic_seed' for synthetic)
+
+    Returns:
+        DataProvider instance
+    """
+    from config import DATA_PARAMS
+
+    name = name or DATA_PARAMS.get('provider', 'yfinance')
+
+    if name == 'yfinance':
+        return YFinanceProvider()
+    if name == 'local':
+        return LocalDirectoryProvider(
+            options.get('root', DATA_PARAMS.get('provider_dir', 'data/ohlcv')),
+            options.get('file_format', DATA_PARAMS.get('provider_format', 'parquet')),
+        )
+    if name == 'synthetic':
+        return SyntheticProvider(
+            seed=options.get('seed', DATA_PARAMS.get('synthetic_seed', 42)),
+            **{key: options[key] for key in ('start', 'end') if key in options}
+        )
+
+    raise ValueError(f"Unknown data provider: {name}")
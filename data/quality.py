@@ -0,0 +1,173 @@
+"""
+Data quality scanner
+====================
+
+Vectorized checks for prepared OHLCV series, run before indicators so bad
+series are dropped instead of producing nonsense bands:
+
+    duplicates      repeated timestamps
+    non_positive    bars with a zero or negative price
+    missing         exchange sessions absent from a daily series
+    zero_volume     longest run of consecutive zero-volume bars
+    split_jumps     close-to-close moves close to a typical split ratio
+
+Each check is a handful of array operations, and the verdict for each
+symbol and interval is cached with the content hash it was computed for, so
+re-scanning an unchanged universe only costs the hashing.
+"""
+
+import threading
+
+import numpy as np
+
+from config import QUALITY_PARAMS
+from data.market_calendar import trading_sessions
+from data.snapshots import content_hash
+
+
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close']
+
+# Split ratios a missing adjustment leaves behind (1.5 is left out: 3x ETFs
+# can legitimately move that much in a day)
+SPLIT_RATIOS = np.array([2.0, 3.0, 4.0, 5.0, 8.0, 10.0, 15.0, 20.0])
+
+
+def longest_run(mask):
+    """
+    Length of the longest run of True values
+
+    Args:
+        mask: 1-D boolean array
+
+    Returns:
+        int: Longest run length (0 if there is none)
+    """
+    mask = np.asarray(mask, dtype=bool)
+    if not mask.any():
+        return 0
+    edges = np.diff(np.r_[0, mask.astype(np.int8), 0])
+    return int((np.flatnonzero(edges == -1) - np.flatnonzero(edges == 1)).max())
+
+
+class QualityReport:
+    """Outcome of scanning one series."""
+
+    def __init__(self, symbol, interval, rows, issues, errors):
+        self.symbol = symbol
+        self.interval = interval
+        self.rows = rows
+        self.issues = issues
+        self.errors = errors
+
+    @property
+    def ok(self):
+        """True if the series is fit for indicator calculations."""
+        return not self.errors
+
+    def __repr__(self):
+        found = {name: count for name, count in self.issues.items() if count}
+        return (f"QualityReport({self.symbol!r}, {self.interval!r}, rows={self.rows}, "
+                f"ok={self.ok}, issues={found}, errors={self.errors})")
+
+
+class QualityScanner:
+    """
+    Thread-safe OHLCV validator with cached verdicts
+    """
+
+    def __init__(self, params=None, calendar='NYSE'):
+        """
+        Initialize the scanner
+
+        Args:
+            params: Thresholds (default: QUALITY_PARAMS)
+            calendar: Exchange calendar for session gaps ('NYSE', or None to
+                      skip the check)
+        """
+        self.params = dict(QUALITY_PARAMS if params is None else params)
+        self.calendar = calendar
+        self._verdicts = {}
+        self._lock = threading.Lock()
+
+    def scan(self, symbol, data, interval='1d'):
+        """
+        Check one prepared series
+
+        Args:
+            symbol: Trading symbol
+            data: Prepared OHLCV DataFrame
+            interval: Data interval (session gaps are only checked for '1d')
+
+        Returns:
+            QualityReport (cached while the data is unchanged)
+        """
+        key = (symbol.upper(), interval)
+        digest = content_hash(data)
+        with self._lock:
+            cached = self._verdicts.get(key)
+        if cached is not None and cached[0] == digest:
+            return cached[1]
+
+        report = self._check(symbol, data, interval)
+        with self._lock:
+            self._verdicts[key] = (digest, report)
+        return report
+
+    def scan_universe(self, frames, interval='1d'):
+        """
+        Check many series
+
+        Args:
+            frames: dict of symbol -> prepared DataFrame (None values are skipped)
+            interval: Data interval
+
+        Returns:
+            dict: Symbol -> QualityReport
+        """
+        return {symbol: self.scan(symbol, data, interval)
+                for symbol, data in frames.items() if data is not None}
+
+    def _check(self, symbol, data, interval):
+        """Run every check on a series."""
+        params = self.params
+        index = data.index
+        issues = {}
+
+        issues['duplicates'] = int(index.duplicated().sum())
+
+        prices = data[[column for column in PRICE_COLUMNS if column in data.columns]].to_numpy()
+        issues['non_positive'] = int((prices <= 0).any(axis=1).sum())
+
+        issues['missing'] = 0
+        if interval == '1d' and self.calendar is not None and len(index):
+            days = index.tz_localize(None) if index.tz is not None else index
+            days = days.normalize()
+            sessions = trading_sessions(days[0], days[-1], self.calendar)
+            issues['missing'] = int((~sessions.isin(days)).sum())
+
+        issues['zero_volume'] = 0
+        if 'Volume' in data.columns:
+            issues['zero_volume'] = longest_run(data['Volume'].to_numpy() == 0)
+
+        issues['split_jumps'] = 0
+        if 'Close' in data.columns and len(data) > 1:
+            close = data['Close'].to_numpy(dtype=np.float64)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                ratio = close[1:] / close[:-1]
+                ratio = np.where(ratio < 1, 1 / ratio, ratio)
+            near = np.abs(ratio[:, None] / SPLIT_RATIOS - 1) <= params['split_tolerance']
+            issues['split_jumps'] = int(near.any(axis=1).sum())
+
+        errors = []
+        if issues['duplicates']:
+            errors.append('duplicates')
+        if issues['non_positive']:
+            errors.append('non_positive')
+        if issues['missing'] > params['max_missing_ratio'] * len(data):
+            errors.append('missing')
+        if params['max_zero_volume_run'] and issues['zero_volume'] > params['max_zero_volume_run']:
+            errors.append('zero_volume')
+        if issues['split_jumps']:
+            errors.append('split_jumps')
+
+        return QualityReport(symbol.upper(), interval, len(data), issues, errors)
@@ -0,0 +1,103 @@
+"""
+Timeframe resampling
+====================
+
+Builds weekly, monthly and quarterly OHLCV bars from daily bars so a single
+daily download serves every timeframe. Bars are labelled the way yfinance
+labels them (week starting Monday, first day of the month/quarter) and each
+bar carries a 'bar_complete' flag: the last bar is only complete once the
+final exchange session of its period has closed.
+"""
+
+import numpy as np
+import pandas as pd
+
+from data.market_calendar import exchange_now, last_sessions, session_close_time
+
+
+# yfinance interval -> pandas period frequency
+RESAMPLE_FREQUENCIES = {
+    '1wk': 'W-SUN',
+    '1mo': 'M',
+    '3mo': 'Q',
+}
+
+
+def resample_ohlcv(daily, interval, calendar='NYSE', now=None):
+    """
+    Aggregate daily bars into a higher timeframe
+
+    Groups are found from the period code of each (sorted) daily bar and
+    reduced with numpy reduceat, so there is no per-group Python work.
+
+    Args:
+        daily: Prepared daily OHLCV DataFrame
+        interval: Target interval ('1wk', '1mo' or '3mo')
+        calendar: 'NYSE', or None for assets that trade every day
+        now: Override for the current time (for completeness checks)
+
+    Returns:
+        DataFrame with Open/High/Low/Close/Volume (and Adj Close if present)
+        plus a boolean 'bar_complete' column
+    """
+    if interval not in RESAMPLE_FREQUENCIES:
+        raise ValueError(f"Cannot resample daily bars to interval {interval}")
+
+    index = daily.index
+    tz = index.tz
+    naive_index = index.tz_localize(None) if tz is not None else index
+
+    periods = naive_index.to_period(RESAMPLE_FREQUENCIES[interval])
+    codes = periods.asi8
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    ends = np.r_[starts[1:] - 1, len(codes) - 1]
+
+    result = {}
+    if 'Open' in daily.columns:
+        result['Open'] = daily['Open'].to_numpy()[starts]
+    if 'High' in daily.columns:
+        result['High'] = np.maximum.reduceat(daily['High'].to_numpy(), starts)
+    if 'Low' in daily.columns:
+        result['Low'] = np.minimum.reduceat(daily['Low'].to_numpy(), starts)
+    if 'Close' in daily.columns:
+        result['Close'] = daily['Close'].to_numpy()[ends]
+    if 'Adj Close' in daily.columns:
+        result['Adj Close'] = daily['Adj Close'].to_numpy()[ends]
+    if 'Volume' in daily.columns:
+        result['Volume'] = np.add.reduceat(daily['Volume'].to_numpy(), starts)
+
+    bar_periods = periods[starts]
+    labels = bar_periods.start_time
+    if tz is not None:
+        labels = labels.tz_localize(tz)
+
+    # Every bar but the last is complete; the last one is complete once the
+    # final session of its period is in the data and has closed
+    complete = np.ones(len(starts), dtype=bool)
+    if len(starts):
+        final_session = last_sessions(bar_periods[-1:].end_time, calendar)[0]
+        last_bar_day = naive_index[-1].normalize()
+        complete[-1] = (last_bar_day > final_session or
+                        (last_bar_day == final_session and
+                         exchange_now(now) >= session_close_time(final_session)))
+
+    result['bar_complete'] = complete
+
+    resampled = pd.DataFrame(result, index=pd.DatetimeIndex(labels, name=daily.index.name))
+    resampled.columns.name = daily.columns.name
+    return resampled
+
+
+def completed_bars(data):
+    """
+    Drop the in-progress bar from resampled data
+
+    Args:
+        data: DataFrame returned by resample_ohlcv
+
+    Returns:
+        DataFrame with only completed bars
+    """
+    if 'bar_complete' not in data.columns:
+        return data
+    return data[data['bar_complete']]
@@ -0,0 +1,67 @@
+"""
+In-flight request coalescing
+============================
+
+Single-flight execution for data requests: the first caller for a key runs
+the load, and callers asking for the same key while it is running wait on
+the same future instead of starting identical downloads. Nothing is kept
+once the load finishes; repeated requests after that are the memory
+cache's job.
+"""
+
+import threading
+from concurrent.futures import Future
+
+
+class SingleFlight:
+    """
+    Thread-safe coalescing of concurrent calls that share a key
+    """
+
+    def __init__(self):
+        """Initialize with no calls in flight."""
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.coalesced = 0
+
+    def do(self, key, fn):
+        """
+        Run fn for a key, or wait for the call already running for it
+
+        Args:
+            key: Hashable request key
+            fn: Zero-argument callable producing the result
+
+        Returns:
+            tuple: (result, shared) where shared is True if the result came
+                   from another caller's call; exceptions raised by fn are
+                   re-raised in every waiting caller
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            return future.result(), True
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    def in_flight(self):
+        """Number of keys currently being loaded."""
+        with self._lock:
+            return len(self._calls)
@@ -0,0 +1,181 @@
+"""
+Dataset snapshots
+=================
+
+Content hashes for prepared OHLCV frames, so downstream caches (indicator
+results, signals, backtests) can be keyed on the data itself rather than
+on when it was fetched: equal hashes mean equal inputs, whatever run or
+machine produced them.
+
+The hash covers the index, column names and values, and costs about a
+millisecond for 10k daily bars. DataHandler stamps it into
+``frame.attrs['content_hash']`` for reference, but content_hash() always
+rehashes: pandas copies attrs onto derived frames, so a stamp can outlive
+the values it was computed for. A manifest records one entry per
+symbol/interval (range, rows, hash) and can be saved next to results to
+tell later runs whether those results are still valid.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+
+import pandas as pd
+
+
+def _hash(data):
+    """Hash of a frame's index, column names and values."""
+    hashes = pd.util.hash_pandas_object(data, index=True).to_numpy()
+    digest = hashlib.blake2b(hashes.tobytes(), digest_size=16)
+    digest.update(','.join(map(str, data.columns)).encode())
+    return digest.hexdigest()
+
+
+def content_hash(data):
+    """
+    Stable content hash of a DataFrame
+
+    Always computed from the data; a stamp in data.attrs is not trusted,
+    since copies inherit it even after their values change.
+
+    Args:
+        data: DataFrame
+
+    Returns:
+        str: 32-character hex digest
+    """
+    return _hash(data)
+
+
+def stamp(data):
+    """
+    Compute the content hash and store it in data.attrs
+
+    The stamp is for reference only (e.g., to log which snapshot a frame
+    came from); content_hash() does not read it.
+
+    Args:
+        data: DataFrame (its attrs are updated in place)
+
+    Returns:
+        str: Content hash
+    """
+    digest = _hash(data)
+    data.attrs['content_hash'] = digest
+    return digest
+
+
+def cache_key(data, *parts, **params):
+    """
+    Key for caching a result computed from a frame
+
+    Args:
+        data: Input DataFrame
+        *parts: Extra key components (e.g., an indicator name)
+        **params: Parameters the result depends on
+
+    Returns:
+        tuple: (content hash, *parts, sorted params)
+    """
+    return (content_hash(data),) + parts + tuple(sorted(params.items()))
+
+
+class SnapshotManifest:
+    """
+    Thread-safe record of the latest snapshot of each symbol/interval
+    """
+
+    def __init__(self, entries=None):
+        """
+        Initialize the manifest
+
+        Args:
+            entries: Existing entries keyed by 'SYMBOL/interval'
+        """
+        self.entries = dict(entries or {})
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(symbol, interval):
+        return f"{symbol.upper()}/{interval}"
+
+    def record(self, symbol, interval, data, digest=None):
+        """
+        Record a prepared frame
+
+        Args:
+            symbol: Trading symbol
+            interval: Data interval
+            data: Prepared DataFrame
+            digest: Its content hash, if already computed (e.g., by stamp())
+
+        Returns:
+            dict: Manifest entry (symbol, interval, first, last, rows, hash)
+        """
+        entry = {
+            'symbol': symbol.upper(),
+            'interval': interval,
+            'first': data.index[0].isoformat() if len(data) else None,
+            'last': data.index[-1].isoformat() if len(data) else None,
+            'rows': len(data),
+            'hash': digest if digest is not None else content_hash(data),
+            'recorded_at': datetime.now().astimezone().isoformat(),
+        }
+        with self._lock:
+            self.entries[self._key(symbol, interval)] = entry
+        return entry
+
+    def get(self, symbol, interval):
+        """Entry for a symbol/interval (None if not recorded)."""
+        with self._lock:
+            return self.entries.get(self._key(symbol, interval))
+
+    def matches(self, symbol, interval, data):
+        """
+        Check whether a frame is the recorded snapshot
+
+        Args:
+            symbol: Trading symbol
+            interval: Data interval
+            data: DataFrame to compare
+
+        Returns:
+            bool: True if the recorded hash equals the frame's hash
+        """
+        entry = self.get(symbol, interval)
+        return entry is not None and entry['hash'] == content_hash(data)
+
+    def save(self, path):
+        """
+        Write the manifest as JSON (atomically)
+
+        Args:
+            path: Output file
+        """
+        with self._lock:
+            entries = dict(self.entries)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp = f"{path}.tmp{os.getpid()}_{threading.get_ident()}"
+        with open(tmp, 'w') as f:
+            json.dump(entries, f, indent=2, sort_keys=True)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Read a manifest written by save()
+
+        Args:
+            path: Manifest file
+
+        Returns:
+            SnapshotManifest (empty if the file does not exist)
+        """
+        if not os.path.exists(path):
+            return cls()
+        with open(path) as f:
+            return cls(json.load(f))
@@ -63,14 +63,21 @@ def generate_fvb_signals(symbol='AAPL',
     
     data_handler = DataHandler()
     
+    # One daily download; weekly bars are resampled from it
+    timeframes = data_handler.get_timeframes(symbol, {'1d': daily_period, '1wk': weekly_period})
+    
     # Daily data
-    daily_data = data_handler.get_data(symbol, period=daily_period, interval='1d')
+    daily_data = timeframes['1d']
     print(f"✓ Loaded {len(daily_data)} daily bars")
     
     # Weekly data
-    weekly_data = data_handler.get_data(symbol, period=weekly_period, interval='1wk')
+    weekly_data = timeframes['1wk']
     print(f"✓ Loaded {len(weekly_data)} weekly bars")
     
+    # Warn about series that would produce unreliable bands
+    if not data_handler.check_quality(symbol, daily_data, '1d').ok:
+        print("⚠ Daily data failed quality checks; bands may be unreliable")
+    
     # ========================================================================
     # STEP 2: Calculate Fair Value Bands
     # ========================================================================
@@ -13,6 +13,9 @@ class BXtrender:
     B-Xtrender Oscillator indicator implementation
     """
 
+    # Only closes are read; loaders can project to these columns
+    INPUT_COLUMNS = ('Close',)
+
     def __init__(self, short_l1=5, short_l2=20, short_l3=15, long_l1=20, long_l2=15, t3_length=5):
         """
         Initialize B-Xtrender indicator
@@ -67,24 +70,32 @@ class BXtrender:
         """
         Calculate B-Xtrender indicator
 
+        Compact (float32) closes are upcast to float64 first, so results
+        only differ from full-precision input by the input rounding:
+        within 1e-4 absolute on the +/-50 oscillator scale, up to 1e-3
+        where the RSI input is nearly flat.
+
         Args:
-            data: DataFrame with OHLC data
+            data: DataFrame with a Close column (other columns are passed
+                  through, see INPUT_COLUMNS)
 
         Returns:
             DataFrame with B-Xtrender calculations
         """
-        df = data.copy()
+        # Only new columns are added, so a shallow copy keeps the input intact
+        df = data.copy(deep=False)
+        close = df['Close'].astype(np.float64)
 
         # Calculate EMAs for short-term Xtrender
-        ema_short_l1 = ta.ema(df['Close'], length=self.short_l1)
-        ema_short_l2 = ta.ema(df['Close'], length=self.short_l2)
+        ema_short_l1 = ta.ema(close, length=self.short_l1)
+        ema_short_l2 = ta.ema(close, length=self.short_l2)
 
         # Calculate short-term Xtrender: RSI(EMA(close, short_l1) - EMA(close, short_l2), short_l3) - 50
         short_diff = ema_short_l1 - ema_short_l2
         short_term_xtrender = ta.rsi(short_diff, length=self.short_l3) - 50
 
         # Calculate long-term Xtrender: RSI(EMA(close, long_l1), long_l2) - 50
-        ema_long_l1 = ta.ema(df['Close'], length=self.long_l1)
+        ema_long_l1 = ta.ema(close, length=self.long_l1)
         long_term_xtrender = ta.rsi(ema_long_l1, length=self.long_l2) - 50
 
         # Calculate T3 moving average of short-term Xtrender
@@ -19,6 +19,20 @@ import pandas as pd
 import numpy as np
 import pandas_ta as ta
 
+from indicators.rolling_median import RollingMedian
+
+
+def _float64_prices(df):
+    """
+    Upcast compact (float32/int) OHLCV columns to float64.
+
+    Band math is always done in float64 so compact inputs only differ from
+    full-precision ones by the rounding of the input prices.
+    """
+    columns = {col: np.float64 for col in ['Open', 'High', 'Low', 'Close', 'Volume']
+               if col in df.columns and df[col].dtype != np.float64}
+    return df.astype(columns) if columns else df
+
 
 def calculate_vwap(df, anchor_period='1D'):
     """
@@ -41,6 +55,35 @@ def calculate_vwap(df, anchor_period='1D'):
     return vwap
 
 
+def window_sma(source, length):
+    """
+    Simple moving average with a fixed, window-local summation order.
+
+    Each window is summed left to right starting from its own first value,
+    so a bar's average depends only on the `length` values in its window.
+    pandas' rolling mean keeps a running sum instead, which carries rounding
+    from earlier windows, so it cannot be reproduced from a rolling buffer;
+    this one can (see FairValueBandsState). The two agree to within a few
+    ulps. Used for smoothing_type='SMA_exact'; 'SMA' stays on pandas_ta.
+
+    Args:
+        source: Price series
+        length: Window size
+
+    Returns:
+        pandas.Series: Averages (NaN until the first full window)
+    """
+    values = np.asarray(source.to_numpy(), dtype=np.float64)
+    averages = np.full(len(values), np.nan)
+    if length > 0 and len(values) >= length:
+        windows = np.lib.stride_tricks.sliding_window_view(values, length)
+        total = windows[:, 0].copy()
+        for k in range(1, length):
+            total += windows[:, k]
+        averages[length - 1:] = total / length
+    return pd.Series(averages, index=source.index)
+
+
 def calculate_smoothed_value(source, length, method='SMA', df=None, anchor_period='1D'):
     """
     Calculate smoothed value using various methods.
@@ -48,7 +91,8 @@ def calculate_smoothed_value(source, length, method='SMA', df=None, anchor_perio
     Args:
         source: Price series to smooth
         length: Smoothing period
-        method: Smoothing method (SMA, EMA, HMA, RMA, WMA, VWMA, Median, VWAP)
+        method: Smoothing method (SMA, SMA_exact, EMA, HMA, RMA, WMA, VWMA,
+                Median, VWAP)
         df: Full DataFrame (needed for VWMA and VWAP)
         anchor_period: VWAP anchor period
         
@@ -57,6 +101,8 @@ def calculate_smoothed_value(source, length, method='SMA', df=None, anchor_perio
     """
     if method == 'SMA':
         return ta.sma(source, length=length)
+    elif method == 'SMA_exact':
+        return window_sma(source, length)
     elif method == 'EMA':
         return ta.ema(source, length=length)
     elif method == 'HMA':
@@ -110,6 +156,286 @@ def get_source(df, source_str):
         return (df['Open'] + df['High'] + df['Low'] + df['Close']) / 4
 
 
+def pivot_masks(values, left=5, right=5):
+    """
+    Vectorized pivot-high and pivot-low detection.
+
+    A bar is a pivot high if its value is >= every value in the `left` bars
+    before and the `right` bars after it (pivot low: <=). This is a sliding
+    window max/min over left + right + 1 bars. Bars without a full window on
+    both sides are never pivots. A NaN anywhere in the window fails every
+    comparison, so those bars are not pivots either.
+
+    Args:
+        values: 1-D array of values (e.g., OHLC4 / fair value spread)
+        left: Bars to the left (pivot strength)
+        right: Bars to the right (confirmation delay)
+
+    Returns:
+        tuple: (is_pivot_high, is_pivot_low) boolean arrays
+    """
+    values = np.asarray(values, dtype=np.float64)
+    is_high = np.zeros(len(values), dtype=bool)
+    is_low = np.zeros(len(values), dtype=bool)
+    if len(values) < left + right + 1:
+        return is_high, is_low
+
+    windows = np.lib.stride_tricks.sliding_window_view(values, left + right + 1)
+    center = values[left:len(values) - right]
+    with np.errstate(invalid='ignore'):
+        is_high[left:len(values) - right] = center >= windows.max(axis=1)
+        is_low[left:len(values) - right] = center <= windows.min(axis=1)
+    return is_high, is_low
+
+
+def delay(values, bars, fill):
+    """
+    Shift an array `bars` positions later, filling the first bars.
+
+    Args:
+        values: 1-D array
+        bars: Number of bars to delay by
+        fill: Value for the first `bars` positions
+
+    Returns:
+        numpy array of the same length and dtype
+    """
+    delayed = np.full_like(values, fill)
+    if bars < len(values):
+        delayed[bars:] = values[:len(values) - bars]
+    return delayed
+
+
+def _contiguous(series):
+    """Contiguous float64 array of a Series' values."""
+    return np.ascontiguousarray(series.to_numpy(), dtype=np.float64)
+
+
+def running_medians(values, accept, capacity, default):
+    """
+    Median of the last `capacity` accepted values, as of every bar.
+
+    Equivalent to pushing values[i] into a capped array on every bar where
+    accept[i] is True and taking the array's median on every bar, but the
+    window is only updated (and its median only read) on accepted bars; the
+    bars in between repeat the last median.
+
+    Args:
+        values: 1-D float64 array
+        accept: Boolean array of bars whose value enters the window
+        capacity: Window size (oldest values are evicted first)
+        default: Median reported before the first accepted bar
+
+    Returns:
+        numpy float64 array of medians
+    """
+    positions = np.flatnonzero(accept)
+    if len(positions) == 0:
+        return np.full(len(values), default, dtype=np.float64)
+
+    window = RollingMedian(capacity=capacity)
+    event_medians = np.empty(len(positions), dtype=np.float64)
+    for k, value in enumerate(values[positions].tolist()):
+        window.push(value)
+        event_medians[k] = window.median()
+
+    # Latest accepted bar at or before every bar (-1 before the first one)
+    latest = np.searchsorted(positions, np.arange(len(values)), side='right') - 1
+    return np.where(latest >= 0, event_medians[np.maximum(latest, 0)], default)
+
+
+def threshold_medians(fair, high, low):
+    """
+    Stage 1 medians: high/low spreads of the last 1000 bars whose range
+    straddled the fair value.
+
+    Args:
+        fair: Fair value
+        high, low: Prices
+
+    Returns:
+        tuple: (median_up_dev, median_down_dev) arrays
+    """
+    with np.errstate(invalid='ignore', divide='ignore'):
+        straddles = (low < fair) & (high > fair)
+        return (running_medians(high / fair, straddles, 1000, 1.0),
+                running_medians(low / fair, straddles, 1000, 1.0))
+
+
+def pivot_medians(ohlc_spread, high, low, threshold_upper, threshold_lower, masks,
+                  pivot_right=5, pivot_mode='centered'):
+    """
+    Stage 2 medians: spreads of the last 2000 deviation pivots outside the
+    threshold bands.
+
+    Args:
+        ohlc_spread: OHLC4 / fair value
+        high, low: Prices
+        threshold_upper, threshold_lower: Threshold bands
+        masks: (is_pivot_high, is_pivot_low) from pivot_masks(ohlc_spread, ...)
+        pivot_right: Confirmation delay of a pivot
+        pivot_mode: 'centered' or 'causal' (see fair_value_bands_kernel)
+
+    Returns:
+        tuple: (median_pivot_up, median_pivot_down) arrays
+    """
+    is_pivot_high, is_pivot_low = masks
+    with np.errstate(invalid='ignore'):
+        pivots_up = is_pivot_high & (low > threshold_upper)
+        pivots_down = is_pivot_low & (high < threshold_lower)
+    pivot_spread = ohlc_spread
+    if pivot_mode == 'causal':
+        pivots_up = delay(pivots_up, pivot_right, False)
+        pivots_down = delay(pivots_down, pivot_right, False)
+        pivot_spread = delay(ohlc_spread, pivot_right, np.nan)
+    return (running_medians(pivot_spread, pivots_up, 2000, 1.02),
+            running_medians(pivot_spread, pivots_down, 2000, 0.98))
+
+
+def deviation_bands(fair, median_pivot_up, median_pivot_down, deviation_boost=1.0):
+    """
+    Stage 2 bands from the pivot medians.
+
+    deviation_boost only scales the band spreads, so a whole vector of
+    boosts is one broadcast: with D boosts and medians of shape (..., n),
+    every band has shape (..., D, n). A scalar boost keeps the medians'
+    shape.
+
+    Args:
+        fair: Fair value, shape (n,)
+        median_pivot_up, median_pivot_down: Pivot medians, shape (..., n)
+        deviation_boost: Multiplier for deviation band width (scalar or 1-D)
+
+    Returns:
+        dict of numpy arrays: deviation_upper/lower_1x/2x
+    """
+    boost = np.asarray(deviation_boost, dtype=np.float64)
+    up_spread = fair * median_pivot_up - fair
+    down_spread = fair - fair * median_pivot_down
+    if boost.ndim:
+        boost = boost[:, None]
+        up_spread = up_spread[..., None, :]
+        down_spread = down_spread[..., None, :]
+    p_band_up_spread = up_spread * boost
+    p_band_down_spread = down_spread * boost
+    deviation_upper_1x = fair + p_band_up_spread
+    deviation_lower_1x = fair - p_band_down_spread
+    return {
+        'deviation_upper_1x': deviation_upper_1x,
+        'deviation_lower_1x': deviation_lower_1x,
+        'deviation_upper_2x': deviation_upper_1x + p_band_up_spread,
+        'deviation_lower_2x': deviation_lower_1x - p_band_down_spread,
+    }
+
+
+def fair_value_bands_kernel(fair, open_, high, low, close, threshold_up, threshold_down,
+                            threshold_boost=1.0, deviation_boost=1.0, trend_mode='Cross',
+                            pivot_left=5, pivot_right=5, pivot_mode='centered'):
+    """
+    Fair Value Bands on contiguous float64 arrays.
+
+    Reproduces the PineScript bar-by-bar logic in stages, each of which
+    only depends on the ones before it:
+
+    1. Threshold bands: fair value times the median high/low spread of the
+       last 1000 bars that straddled the fair value.
+    2. Deviation pivots: spread pivots (pivot_masks) outside the threshold
+       bands; fair value times the median of the last 2000 such pivots
+       gives the 1x/2x deviation bands. In 'centered' mode a pivot enters
+       the median window on its own bar, which uses the `pivot_right` bars
+       after it. In 'causal' mode it enters on the bar that confirms it,
+       `pivot_right` bars later, like PineScript ta.pivothigh/pivotlow, so
+       every row only depends on bars up to and including that row.
+    3. Trend direction: the last threshold cross (or fair value change in
+       'Direction' mode), carried forward; the first bar is 0.
+
+    Only the two median windows are sequential, and they are updated on
+    accepted bars only (running_medians); everything else is vectorized.
+    Results are bit-identical to evaluating the PineScript rules per bar.
+
+    Args:
+        fair: Fair value (smoothed source)
+        open_, high, low, close: Prices
+        threshold_up: Source compared to the upper threshold band
+        threshold_down: Source compared to the lower threshold band
+        threshold_boost: Multiplier for threshold band width
+        deviation_boost: Multiplier for deviation band width
+        trend_mode: 'Cross' or 'Direction'
+        pivot_left: Bars left of a deviation pivot it must exceed
+        pivot_right: Bars right of a deviation pivot it must exceed
+        pivot_mode: 'centered' or 'causal' (see stage 2)
+
+    Returns:
+        dict of numpy arrays: threshold_upper, threshold_lower,
+        trend_direction (int64), median_pivot_up, median_pivot_down and
+        deviation_upper/lower_1x/2x
+    """
+    n = len(fair)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        ohlc_spread = ((open_ + high + low + close) / 4) / fair
+
+        # Stage 1: threshold bands from bars whose range straddles fair value
+        median_up_dev, median_down_dev = threshold_medians(fair, high, low)
+        band_up_spread = fair * median_up_dev - fair
+        band_down_spread = fair - fair * median_down_dev
+        threshold_upper = fair + band_up_spread * threshold_boost
+        threshold_lower = fair - band_down_spread * threshold_boost
+
+        # Stage 2: deviation bands from pivots outside the threshold bands
+        median_pivot_up, median_pivot_down = pivot_medians(
+            ohlc_spread, high, low, threshold_upper, threshold_lower,
+            pivot_masks(ohlc_spread, pivot_left, pivot_right), pivot_right, pivot_mode
+        )
+        bands = deviation_bands(fair, median_pivot_up, median_pivot_down, deviation_boost)
+
+        # Stage 3: trend direction (down wins over up), carried forward
+        if trend_mode == 'Cross':
+            rule_up = threshold_up > threshold_upper
+            rule_down = threshold_down < threshold_lower
+        else:  # Direction
+            rule_up = np.zeros(n, dtype=bool)
+            rule_down = np.zeros(n, dtype=bool)
+            rule_up[1:] = fair[1:] > fair[:-1]
+            rule_down[1:] = fair[1:] < fair[:-1]
+
+    switches = np.where(rule_down, -1, np.where(rule_up, 1, 0)).astype(np.int64)
+    changed = rule_down | rule_up
+    if n:
+        changed[0] = False
+    latest = np.maximum.accumulate(np.where(changed, np.arange(n), -1))
+    trend_direction = np.where(latest >= 0, switches[np.maximum(latest, 0)], 0).astype(np.int64)
+
+    return {
+        'threshold_upper': threshold_upper,
+        'threshold_lower': threshold_lower,
+        'trend_direction': trend_direction,
+        'median_pivot_up': median_pivot_up,
+        'median_pivot_down': median_pivot_down,
+        **bands,
+    }
+
+
+def fair_value_bands_columns(smoothing_type='SMA', **params):
+    """
+    Input columns calculate_fair_value_bands reads.
+
+    OHLC is always needed (OHLC4 spreads and the High/Low band tests);
+    Volume only for VWMA and VWAP smoothing.
+
+    Args:
+        smoothing_type: Smoothing method
+        **params: Other Fair Value Bands parameters (ignored)
+
+    Returns:
+        tuple: Column names, for DataHandler.get_data(columns=...) or get_view
+    """
+    columns = ('Open', 'High', 'Low', 'Close')
+    if smoothing_type in ('VWMA', 'VWAP'):
+        columns += ('Volume',)
+    return columns
+
+
 def calculate_fair_value_bands(df, 
                                smoothing_type='SMA',
                                length=33,
@@ -119,7 +445,10 @@ def calculate_fair_value_bands(df,
                                threshold_boost=1.0,
                                deviation_boost=1.0,
                                vwap_anchor='1D',
-                               trend_mode='Cross'):
+                               trend_mode='Cross',
+                               pivot_left=5,
+                               pivot_right=5,
+                               pivot_mode='centered'):
     """
     Calculate Fair Value Bands indicator.
     
@@ -128,9 +457,20 @@ def calculate_fair_value_bands(df,
     2. Threshold bands (close proximity to fair value)
     3. Deviation bands (1x and 2x standard deviations)
     
+    Compact inputs (float32 prices, see data_handler.compact_ohlcv) are
+    upcast to float64 before any arithmetic. Relative to the full-precision
+    input, fair_value and the band columns agree to within 1e-7 relative on
+    daily histories. A pivot or threshold test that is a near-tie at float32
+    resolution can still flip, which moves that median window by one entry,
+    so compare compact results with a tolerance of rtol=1e-6 and allow for
+    rare isolated outliers.
+
     Args:
-        df: DataFrame with OHLCV data
-        smoothing_type: Type of smoothing (SMA, EMA, HMA, RMA, WMA, VWMA, Median, VWAP)
+        df: DataFrame with OHLCV data (fair_value_bands_columns() lists the
+            columns actually read; others are passed through)
+        smoothing_type: Type of smoothing (SMA, SMA_exact, EMA, HMA, RMA, WMA, VWMA,
+                        Median, VWAP); SMA_exact is the SMA FairValueBandsState
+                        reproduces bit for bit (see window_sma)
         length: Smoothing period
         source_str: Price source for fair value calculation
         threshold_up_str: Price source for upper threshold
@@ -139,11 +479,19 @@ def calculate_fair_value_bands(df,
         deviation_boost: Multiplier for deviation band width
         vwap_anchor: VWAP anchor period (for VWAP smoothing type)
         trend_mode: Trend determination mode (Cross or Direction)
+        pivot_left: Bars left of a deviation pivot it must exceed
+        pivot_right: Bars right of a deviation pivot it must exceed
+        pivot_mode: 'centered' counts a deviation pivot from its own bar,
+                    which looks `pivot_right` bars ahead; 'causal' counts it
+                    from the bar that confirms it, so every row only uses
+                    data known at that bar (as FairValueBandsState does)
         
     Returns:
         pandas.DataFrame: Original data with added fair value band columns
     """
-    result = df.copy()
+    # Only new columns are added, so a shallow copy keeps the input intact
+    result = df.copy(deep=False)
+    df = _float64_prices(df)
     
     # Get price sources
     source = get_source(df, source_str)
@@ -156,139 +504,122 @@ def calculate_fair_value_bands(df,
     )
     result['fair_value'] = fair_price_smooth
     
-    # ========================================================================
-    # BAR-BY-BAR CALCULATION (Matching PineScript exactly)
-    # ========================================================================
-    # PineScript uses var arrays that build up sequentially across all bars
-    # We need to replicate this exact sequential processing
-    
-    # Pre-calculate vectorized values for speed
-    low_spread = df['Low'] / fair_price_smooth
-    high_spread = df['High'] / fair_price_smooth
-    ohlc4 = (df['Open'] + df['High'] + df['Low'] + df['Close']) / 4
-    ohlc_spread = ohlc4 / fair_price_smooth
-    
-    # Initialize var arrays (like PineScript)
-    deviation_up_list = []
-    deviation_down_list = []
-    pivot_ups_array = []
-    pivot_downs_array = []
-    
-    # Store results for each bar
-    threshold_upper_values = []
-    threshold_lower_values = []
-    median_pivot_up_values = []
-    median_pivot_down_values = []
-    dir_switch_values = [0]  # Start with 0
-    
-    for i in range(len(df)):
-        # ---------------------------------------------------------------------
-        # STEP 1: Update deviation arrays (threshold band calculation)
-        # ---------------------------------------------------------------------
-        if pd.notna(fair_price_smooth.iloc[i]):
-            if df['Low'].iloc[i] < fair_price_smooth.iloc[i] and df['High'].iloc[i] > fair_price_smooth.iloc[i]:
-                deviation_up_list.append(high_spread.iloc[i])
-                deviation_down_list.append(low_spread.iloc[i])
-                # Limit to 1000 like PineScript
-                if len(deviation_up_list) > 1000:
-                    deviation_up_list.pop(0)
-                if len(deviation_down_list) > 1000:
-                    deviation_down_list.pop(0)
-        
-        # Calculate median deviations
-        median_up_dev = np.median(deviation_up_list) if len(deviation_up_list) > 0 else 1.0
-        median_down_dev = np.median(deviation_down_list) if len(deviation_down_list) > 0 else 1.0
-        
-        # Threshold bands
-        upper_band = fair_price_smooth.iloc[i] * median_up_dev
-        lower_band = fair_price_smooth.iloc[i] * median_down_dev
-        
-        band_up_spread = upper_band - fair_price_smooth.iloc[i]
-        band_down_spread = fair_price_smooth.iloc[i] - lower_band
-        
-        upper_band_boosted = fair_price_smooth.iloc[i] + (band_up_spread * threshold_boost)
-        lower_band_boosted = fair_price_smooth.iloc[i] - (band_down_spread * threshold_boost)
-        
-        threshold_upper_values.append(upper_band_boosted)
-        threshold_lower_values.append(lower_band_boosted)
-        
-        # ---------------------------------------------------------------------
-        # STEP 2: Detect and record pivots (deviation band calculation)
-        # ---------------------------------------------------------------------
-        if i >= 5 and i < len(df) - 5:
-            # Pivot high detection
-            is_pivot_high = all(ohlc_spread.iloc[i] >= ohlc_spread.iloc[i-j] for j in range(1, 6)) and \
-                            all(ohlc_spread.iloc[i] >= ohlc_spread.iloc[i+j] for j in range(1, 6))
-            
-            # Pivot low detection
-            is_pivot_low = all(ohlc_spread.iloc[i] <= ohlc_spread.iloc[i-j] for j in range(1, 6)) and \
-                           all(ohlc_spread.iloc[i] <= ohlc_spread.iloc[i+j] for j in range(1, 6))
-            
-            # Only add pivot if price is outside threshold bands
-            if is_pivot_high and not pd.isna(ohlc_spread.iloc[i]):
-                if df['Low'].iloc[i] > upper_band_boosted:
-                    pivot_ups_array.append(ohlc_spread.iloc[i])
-                    if len(pivot_ups_array) > 2000:
-                        pivot_ups_array.pop(0)
-            
-            if is_pivot_low and not pd.isna(ohlc_spread.iloc[i]):
-                if df['High'].iloc[i] < lower_band_boosted:
-                    pivot_downs_array.append(ohlc_spread.iloc[i])
-                    if len(pivot_downs_array) > 2000:
-                        pivot_downs_array.pop(0)
-        
-        # Calculate median pivots
-        median_pivot_up = np.median(pivot_ups_array) if len(pivot_ups_array) > 0 else 1.02
-        median_pivot_down = np.median(pivot_downs_array) if len(pivot_downs_array) > 0 else 0.98
-        
-        median_pivot_up_values.append(median_pivot_up)
-        median_pivot_down_values.append(median_pivot_down)
-        
-        # ---------------------------------------------------------------------
-        # STEP 3: Trend direction
-        # ---------------------------------------------------------------------
-        if i > 0:
-            if trend_mode == 'Cross':
-                trend_rule_up = threshold_up_src.iloc[i] > upper_band_boosted
-                trend_rule_down = threshold_down_src.iloc[i] < lower_band_boosted
-            else:  # Direction
-                trend_rule_up = fair_price_smooth.iloc[i] > fair_price_smooth.iloc[i-1]
-                trend_rule_down = fair_price_smooth.iloc[i] < fair_price_smooth.iloc[i-1]
-            
-            if trend_rule_down:
-                dir_switch_values.append(-1)
-            elif trend_rule_up:
-                dir_switch_values.append(1)
-            else:
-                dir_switch_values.append(dir_switch_values[-1])
-    
-    # Store all calculated values
-    result['threshold_upper'] = threshold_upper_values
-    result['threshold_lower'] = threshold_lower_values
-    result['trend_direction'] = dir_switch_values
-    
-    # Convert median pivots to series
-    median_pivot_up_series = pd.Series(median_pivot_up_values, index=df.index)
-    median_pivot_down_series = pd.Series(median_pivot_down_values, index=df.index)
-    
-    # Deviation bands (1x and 2x) - matching PineScript exactly
-    pivot_band_up_base = fair_price_smooth * median_pivot_up_series
-    pivot_band_down_base = fair_price_smooth * median_pivot_down_series
-    
-    p_band_up_spread = (pivot_band_up_base - fair_price_smooth) * deviation_boost
-    p_band_down_spread = (fair_price_smooth - pivot_band_down_base) * deviation_boost
-    
-    # 1x bands
-    result['deviation_upper_1x'] = fair_price_smooth + p_band_up_spread
-    result['deviation_lower_1x'] = fair_price_smooth - p_band_down_spread
+    # Band math runs on plain NumPy arrays (see fair_value_bands_kernel)
+    bands = fair_value_bands_kernel(
+        _contiguous(fair_price_smooth), _contiguous(df['Open']), _contiguous(df['High']),
+        _contiguous(df['Low']), _contiguous(df['Close']),
+        _contiguous(threshold_up_src), _contiguous(threshold_down_src),
+        threshold_boost=threshold_boost, deviation_boost=deviation_boost,
+        trend_mode=trend_mode, pivot_left=pivot_left, pivot_right=pivot_right,
+        pivot_mode=pivot_mode
+    )
     
-    # 2x bands (add spread again, exactly like PineScript)
-    result['deviation_upper_2x'] = result['deviation_upper_1x'] + p_band_up_spread
-    result['deviation_lower_2x'] = result['deviation_lower_1x'] - p_band_down_spread
+    for column in ['threshold_upper', 'threshold_lower', 'trend_direction',
+                   'deviation_upper_1x', 'deviation_lower_1x',
+                   'deviation_upper_2x', 'deviation_lower_2x']:
+        result[column] = bands[column]
     
     return result
 
 
+def point_in_time_fair_value_bands(df, **params):
+    """
+    Fair Value Bands as they were known at each bar.
+
+    Row i equals the last row of calculate_fair_value_bands run on the bars
+    up to and including bar i, but the whole series costs one
+    O(n log k) pass instead of n recomputations: smoothing, the threshold
+    median windows and the trend only use past bars, and deviation pivots
+    are counted from the bar that confirms them (pivot_mode='causal').
+    Use it wherever a row is compared with that bar's price, as in a
+    backtest.
+
+    Args:
+        df: DataFrame with OHLCV data
+        **params: Fair Value Bands parameters (pivot_mode is overridden)
+
+    Returns:
+        pandas.DataFrame: Original data with added fair value band columns
+    """
+    return calculate_fair_value_bands(df, **{**params, 'pivot_mode': 'causal'})
+
+
+def fair_value_bands_sweep(df,
+                           threshold_boosts=(1.0,),
+                           deviation_boosts=(1.0,),
+                           smoothing_type='SMA',
+                           length=33,
+                           source_str='OHLC4',
+                           vwap_anchor='1D',
+                           pivot_left=5,
+                           pivot_right=5,
+                           pivot_mode='centered',
+                           **params):
+    """
+    Fair Value Bands for a grid of threshold_boost and deviation_boost values.
+
+    For calibration sweeps. The fair value, the straddle medians behind the
+    threshold bands and the pivot masks do not depend on either boost and
+    are computed once. Each threshold_boost moves the threshold bands and
+    therefore which pivots are accepted, so the pivot medians are computed
+    once per threshold_boost. deviation_boost only scales the final spreads
+    and is applied to every threshold_boost at once by broadcasting
+    (deviation_bands). Every slice is bit-identical to
+    calculate_fair_value_bands with the same boosts.
+
+    Args:
+        df: DataFrame with OHLCV data
+        threshold_boosts: T threshold_boost values
+        deviation_boosts: D deviation_boost values
+        smoothing_type, length, source_str, vwap_anchor: Fair value settings
+        pivot_left, pivot_right, pivot_mode: Deviation pivot settings
+        **params: Other Fair Value Bands parameters (threshold sources,
+                  trend_mode, single boosts); ignored, as trend direction
+                  is not part of the sweep
+
+    Returns:
+        dict of numpy arrays: fair_value (n,), threshold_boost (T,),
+        deviation_boost (D,), threshold_upper/lower and
+        median_pivot_up/down (T, n), deviation_upper/lower_1x/2x (T, D, n)
+    """
+    df = _float64_prices(df)
+    fair = _contiguous(calculate_smoothed_value(
+        get_source(df, source_str), length, smoothing_type, df, vwap_anchor
+    ))
+    open_, high, low, close = (_contiguous(df[col]) for col in ['Open', 'High', 'Low', 'Close'])
+    threshold_boosts = np.atleast_1d(np.asarray(threshold_boosts, dtype=np.float64))
+    deviation_boosts = np.atleast_1d(np.asarray(deviation_boosts, dtype=np.float64))
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        ohlc_spread = ((open_ + high + low + close) / 4) / fair
+        median_up_dev, median_down_dev = threshold_medians(fair, high, low)
+        band_up_spread = fair * median_up_dev - fair
+        band_down_spread = fair - fair * median_down_dev
+        threshold_upper = fair + band_up_spread * threshold_boosts[:, None]
+        threshold_lower = fair - band_down_spread * threshold_boosts[:, None]
+
+        masks = pivot_masks(ohlc_spread, pivot_left, pivot_right)
+        median_pivot_up = np.empty_like(threshold_upper)
+        median_pivot_down = np.empty_like(threshold_lower)
+        for k in range(len(threshold_boosts)):
+            median_pivot_up[k], median_pivot_down[k] = pivot_medians(
+                ohlc_spread, high, low, threshold_upper[k], threshold_lower[k], masks,
+                pivot_right, pivot_mode
+            )
+        bands = deviation_bands(fair, median_pivot_up, median_pivot_down, deviation_boosts)
+
+    return {
+        'fair_value': fair,
+        'threshold_boost': threshold_boosts,
+        'deviation_boost': deviation_boosts,
+        'threshold_upper': threshold_upper,
+        'threshold_lower': threshold_lower,
+        'median_pivot_up': median_pivot_up,
+        'median_pivot_down': median_pivot_down,
+        **bands,
+    }
+
+
 # Default parameters matching PineScript defaults
 FAIR_VALUE_PARAMS = {
     'smoothing_type': 'SMA',
@@ -299,6 +630,9 @@ FAIR_VALUE_PARAMS = {
     'threshold_boost': 1.0,
     'deviation_boost': 1.0,
     'vwap_anchor': '1D',
-    'trend_mode': 'Cross'
+    'trend_mode': 'Cross',
+    'pivot_left': 5,
+    'pivot_right': 5,
+    'pivot_mode': 'centered'
 }
 
@@ -0,0 +1,390 @@
+"""
+Streaming Fair Value Bands
+==========================
+
+Bar-by-bar Fair Value Bands for incremental updates. An end-of-day refresh
+keeps one FairValueBandsState per symbol and feeds it the new bar, instead
+of recomputing the whole history with calculate_fair_value_bands.
+
+The state holds everything the batch calculation carries from bar to bar:
+
+    smoothing buffer    the last `length` source values
+    deviation windows   high/low spreads of bars that straddled fair value
+    pivot buffer        the last left + right + 1 bars, waiting for the
+                        right-hand bars of the pivot candidate in the middle
+    pivot windows       spreads of accepted deviation pivots
+    trend state         last trend direction and fair value
+
+A pivot needs `pivot_right` later bars, so the candidate at bar i - right is
+decided when bar i arrives. The bars update() returns are therefore exactly
+the rows of calculate_fair_value_bands(..., pivot_mode='causal') and, for
+the latest bar, also the last row of a 'centered' run over the bars so far.
+Earlier rows of a 'centered' run differ: it counts a pivot from the pivot
+bar itself, using right-hand bars that had not closed at that point.
+
+Only window-local smoothing can be reproduced exactly from a buffer:
+'SMA_exact' (window_sma) and 'Median' match the batch bit for bit. 'SMA' is
+streamed with the same window-local sum, so it matches a batch 'SMA' run
+(pandas_ta, a running sum) only to within a few ulps; ask for 'SMA_exact'
+in both when the two must agree exactly.
+
+save() writes the state to a compressed .npz checkpoint: a few float arrays
+of at most 1000 + 2000 + 1000 + 2000 values, whatever the history length.
+resume() loads one and feeds it the bars added since, so a new process or
+worker does not have to replay decades of bars to warm up.
+"""
+
+import json
+import os
+import threading
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from indicators.fair_value_bands import FAIR_VALUE_PARAMS, get_source
+from indicators.rolling_median import RollingMedian
+
+
+STREAMING_SMOOTHING = ('SMA', 'SMA_exact', 'Median')
+
+CHECKPOINT_VERSION = 1
+
+BAND_COLUMNS = ['fair_value', 'threshold_upper', 'threshold_lower', 'trend_direction',
+                'deviation_upper_1x', 'deviation_lower_1x',
+                'deviation_upper_2x', 'deviation_lower_2x']
+
+
+class FairValueBandsState:
+    """
+    Incremental Fair Value Bands for one symbol
+    """
+
+    def __init__(self,
+                 smoothing_type='SMA',
+                 length=33,
+                 source_str='OHLC4',
+                 threshold_up_str='Low',
+                 threshold_down_str='High',
+                 threshold_boost=1.0,
+                 deviation_boost=1.0,
+                 vwap_anchor='1D',
+                 trend_mode='Cross',
+                 pivot_left=5,
+                 pivot_right=5,
+                 pivot_mode='causal'):
+        """
+        Initialize an empty state
+
+        Takes the same parameters as calculate_fair_value_bands.
+
+        Args:
+            smoothing_type: 'SMA', 'SMA_exact' or 'Median' (see STREAMING_SMOOTHING)
+            length: Smoothing period
+            source_str: Price source for fair value calculation
+            threshold_up_str: Price source for upper threshold
+            threshold_down_str: Price source for lower threshold
+            threshold_boost: Multiplier for threshold band width
+            deviation_boost: Multiplier for deviation band width
+            vwap_anchor: Unused (VWAP smoothing is not supported)
+            trend_mode: Trend determination mode (Cross or Direction)
+            pivot_left: Bars left of a deviation pivot it must exceed
+            pivot_right: Bars right of a deviation pivot it must exceed
+            pivot_mode: Ignored; pivots are always counted from the bar that
+                        confirms them (pivot_mode='causal')
+        """
+        if smoothing_type not in STREAMING_SMOOTHING:
+            raise ValueError(f"Streaming Fair Value Bands support {STREAMING_SMOOTHING} "
+                             f"smoothing, not {smoothing_type}")
+
+        self.params = {
+            'smoothing_type': smoothing_type,
+            'length': length,
+            'source_str': source_str,
+            'threshold_up_str': threshold_up_str,
+            'threshold_down_str': threshold_down_str,
+            'threshold_boost': threshold_boost,
+            'deviation_boost': deviation_boost,
+            'vwap_anchor': vwap_anchor,
+            'trend_mode': trend_mode,
+            'pivot_left': pivot_left,
+            'pivot_right': pivot_right,
+        }
+
+        self.bars = 0
+        self.last_index = None
+        self.last_bar = ()
+        self.smoothing = deque(maxlen=length)
+        self.up_deviations = RollingMedian(capacity=1000)
+        self.down_deviations = RollingMedian(capacity=1000)
+        # (ohlc spread, low, high, threshold_upper, threshold_lower) per bar
+        self.pivot_buffer = deque(maxlen=pivot_left + pivot_right + 1)
+        self.pivots_up = RollingMedian(capacity=2000)
+        self.pivots_down = RollingMedian(capacity=2000)
+        self.trend_direction = 0
+        self.last_fair_value = np.nan
+
+    @classmethod
+    def from_history(cls, df, **params):
+        """
+        Build a state by replaying a history
+
+        Args:
+            df: DataFrame with OHLC data, oldest bar first
+            **params: Fair Value Bands parameters (default: FAIR_VALUE_PARAMS)
+
+        Returns:
+            FairValueBandsState positioned after the last bar of `df`
+        """
+        state = cls(**{**FAIR_VALUE_PARAMS, **params})
+        state.update_many(df)
+        return state
+
+    def _fair_value(self):
+        """Smoothed source over the buffer (NaN until it is full)."""
+        buffer = self.smoothing
+        if len(buffer) < buffer.maxlen:
+            return np.nan
+        if self.params['smoothing_type'] == 'Median':
+            return float(np.median(np.array(buffer)))
+        # Same left-to-right order as window_sma
+        values = iter(buffer)
+        total = next(values)
+        for value in values:
+            total += value
+        return total / buffer.maxlen
+
+    def _confirm_pivot(self):
+        """Decide the pivot candidate in the middle of a full pivot buffer."""
+        buffer = self.pivot_buffer
+        if len(buffer) < buffer.maxlen:
+            return
+        spread, low, high, threshold_upper, threshold_lower = buffer[self.params['pivot_left']]
+        # NaN anywhere in the window fails a comparison, as in pivot_masks
+        if all(spread >= entry[0] for entry in buffer) and low > threshold_upper:
+            self.pivots_up.push(spread)
+        if all(spread <= entry[0] for entry in buffer) and high < threshold_lower:
+            self.pivots_down.push(spread)
+
+    def update(self, bar):
+        """
+        Add one closed bar
+
+        Args:
+            bar: Mapping with Open/High/Low/Close values (e.g., a DataFrame
+                 row); its `name`, if any, is kept as last_index
+
+        Returns:
+            dict: fair_value, threshold_upper, threshold_lower,
+            trend_direction and deviation_upper/lower_1x/2x for this bar,
+            equal to the row of calculate_fair_value_bands(...,
+            pivot_mode='causal') for this bar (bit for bit with 'SMA_exact'
+            or 'Median' smoothing)
+        """
+        params = self.params
+        index = getattr(bar, 'name', None)
+        bar = {column: float(bar[column]) for column in ['Open', 'High', 'Low', 'Close']}
+        open_, high, low, close = bar['Open'], bar['High'], bar['Low'], bar['Close']
+
+        self.smoothing.append(get_source(bar, params['source_str']))
+        fair = self._fair_value()
+
+        # Threshold bands from bars whose range straddles fair value
+        if low < fair < high:
+            self.up_deviations.push(high / fair)
+            self.down_deviations.push(low / fair)
+        median_up_dev = self.up_deviations.median(1.0)
+        median_down_dev = self.down_deviations.median(1.0)
+        band_up_spread = fair * median_up_dev - fair
+        band_down_spread = fair - fair * median_down_dev
+        threshold_upper = fair + band_up_spread * params['threshold_boost']
+        threshold_lower = fair - band_down_spread * params['threshold_boost']
+
+        # Deviation bands from the pivot confirmed by this bar
+        ohlc_spread = ((open_ + high + low + close) / 4) / fair
+        self.pivot_buffer.append((ohlc_spread, low, high, threshold_upper, threshold_lower))
+        self._confirm_pivot()
+        median_pivot_up = self.pivots_up.median(1.02)
+        median_pivot_down = self.pivots_down.median(0.98)
+        p_band_up_spread = (fair * median_pivot_up - fair) * params['deviation_boost']
+        p_band_down_spread = (fair - fair * median_pivot_down) * params['deviation_boost']
+        deviation_upper_1x = fair + p_band_up_spread
+        deviation_lower_1x = fair - p_band_down_spread
+
+        # Trend direction (down wins over up); the first bar is 0
+        if params['trend_mode'] == 'Cross':
+            rule_up = get_source(bar, params['threshold_up_str']) > threshold_upper
+            rule_down = get_source(bar, params['threshold_down_str']) < threshold_lower
+        else:  # Direction
+            rule_up = fair > self.last_fair_value
+            rule_down = fair < self.last_fair_value
+        if self.bars:
+            if rule_down:
+                self.trend_direction = -1
+            elif rule_up:
+                self.trend_direction = 1
+
+        self.last_fair_value = fair
+        self.last_index = index
+        self.last_bar = (open_, high, low, close)
+        self.bars += 1
+
+        return {
+            'fair_value': fair,
+            'threshold_upper': threshold_upper,
+            'threshold_lower': threshold_lower,
+            'trend_direction': self.trend_direction,
+            'deviation_upper_1x': deviation_upper_1x,
+            'deviation_lower_1x': deviation_lower_1x,
+            'deviation_upper_2x': deviation_upper_1x + p_band_up_spread,
+            'deviation_lower_2x': deviation_lower_1x - p_band_down_spread,
+        }
+
+    def update_many(self, df):
+        """
+        Add several closed bars
+
+        Args:
+            df: DataFrame with OHLC data, oldest bar first
+
+        Returns:
+            list of dicts, one per bar (see update)
+        """
+        rows = []
+        for timestamp, bar in zip(df.index, df[['Open', 'High', 'Low', 'Close']].to_dict('records')):
+            rows.append(self.update(bar))
+            self.last_index = timestamp
+        return rows
+
+    def save(self, path):
+        """
+        Write a checkpoint (atomically)
+
+        Args:
+            path: Output .npz file
+        """
+        arrays = {
+            'version': np.array(CHECKPOINT_VERSION),
+            'params': np.array(json.dumps(self.params, sort_keys=True)),
+            'bars': np.array(self.bars),
+            'last_index': np.array('' if self.last_index is None
+                                   else pd.Timestamp(self.last_index).isoformat()),
+            'smoothing': np.array(self.smoothing, dtype=np.float64),
+            'up_deviations': np.array(self.up_deviations.values(), dtype=np.float64),
+            'down_deviations': np.array(self.down_deviations.values(), dtype=np.float64),
+            'pivot_buffer': np.array(self.pivot_buffer, dtype=np.float64).reshape(-1, 5),
+            'pivots_up': np.array(self.pivots_up.values(), dtype=np.float64),
+            'pivots_down': np.array(self.pivots_down.values(), dtype=np.float64),
+            'trend': np.array([self.trend_direction, self.last_fair_value], dtype=np.float64),
+            'last_bar': np.array(self.last_bar, dtype=np.float64),
+        }
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp = f"{path}.tmp{os.getpid()}_{threading.get_ident()}.npz"
+        np.savez_compressed(tmp, **arrays)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Read a checkpoint written by save()
+
+        Args:
+            path: Checkpoint file
+
+        Returns:
+            FairValueBandsState, or None if the file is missing or unreadable
+        """
+        if not os.path.exists(path):
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as checkpoint:
+                if int(checkpoint['version']) != CHECKPOINT_VERSION:
+                    print(f"Ignoring checkpoint {path}: unsupported version")
+                    return None
+                state = cls(**json.loads(str(checkpoint['params'])))
+                state.bars = int(checkpoint['bars'])
+                last_index = str(checkpoint['last_index'])
+                state.last_index = pd.Timestamp(last_index) if last_index else None
+                state.smoothing.extend(checkpoint['smoothing'].tolist())
+                state.up_deviations = RollingMedian.from_values(
+                    checkpoint['up_deviations'].tolist(), capacity=1000)
+                state.down_deviations = RollingMedian.from_values(
+                    checkpoint['down_deviations'].tolist(), capacity=1000)
+                state.pivot_buffer.extend(map(tuple, checkpoint['pivot_buffer'].tolist()))
+                state.pivots_up = RollingMedian.from_values(
+                    checkpoint['pivots_up'].tolist(), capacity=2000)
+                state.pivots_down = RollingMedian.from_values(
+                    checkpoint['pivots_down'].tolist(), capacity=2000)
+                trend_direction, last_fair_value = checkpoint['trend'].tolist()
+                state.trend_direction = int(trend_direction)
+                state.last_fair_value = last_fair_value
+                state.last_bar = tuple(checkpoint['last_bar'].tolist())
+        except Exception as e:
+            print(f"Error reading checkpoint {path}: {str(e)}")
+            return None
+        return state
+
+    @classmethod
+    def resume(cls, path, df, history=None, **params):
+        """
+        Continue from a checkpoint, then save the updated state
+
+        The checkpoint is used when it was written with the same parameters
+        and its last bar is still in `df` with unchanged prices; only the
+        bars after it are fed, so `df` can be a short recent window.
+        Otherwise (no checkpoint, new parameters, revised or shorter
+        history) the state has to be rebuilt: from `history` when given,
+        else from `df` with a warning, since a short window would leave the
+        median windows filled from those bars only.
+
+        Args:
+            path: Checkpoint file
+            df: DataFrame with OHLC data, oldest bar first
+            history: Full history to rebuild from (a DataFrame, or a
+                     callable returning one, so it is only loaded when
+                     needed); bars of `df` after its last bar are fed too
+            **params: Fair Value Bands parameters (default: FAIR_VALUE_PARAMS)
+
+        Returns:
+            FairValueBandsState positioned after the last bar of `df`
+        """
+        params = {**FAIR_VALUE_PARAMS, **params}
+        state = cls.load(path)
+        reason = 'no usable checkpoint' if state is None else state._mismatch(df, params)
+        if reason is None:
+            position = df.index.get_loc(state.last_index)
+            state.update_many(df.iloc[position + 1:])
+        else:
+            if history is None:
+                print(f"Rebuilding Fair Value Bands state {path} from the {len(df)} bars given "
+                      f"({reason}); pass history= to rebuild from the full history")
+                state = cls.from_history(df, **params)
+            else:
+                print(f"Rebuilding Fair Value Bands state {path} from history ({reason})")
+                full = history() if callable(history) else history
+                state = cls.from_history(full, **params)
+                if len(full):
+                    state.update_many(df[df.index > full.index[-1]])
+        state.save(path)
+        return state
+
+    def _mismatch(self, df, params):
+        """
+        Check whether `df` extends the bars this state has seen
+
+        Returns:
+            str: Why the state cannot be continued with `df`, or None if it can
+        """
+        if any(params.get(key) != value for key, value in self.params.items()):
+            return 'parameters changed'
+        if self.last_index is None or self.last_index not in df.index:
+            return 'checkpoint bar not in the data'
+        position = df.index.get_loc(self.last_index)
+        if not isinstance(position, int):
+            return 'checkpoint bar not in the data'
+        prices = df[['Open', 'High', 'Low', 'Close']].iloc[position].to_numpy(dtype=np.float64)
+        if tuple(prices.tolist()) != self.last_bar:
+            return 'history was revised'
+        return None
@@ -0,0 +1,164 @@
+"""
+Rolling Median
+==============
+
+Median of the most recent values with FIFO eviction, as used by the Fair
+Value Bands deviation and pivot arrays (PineScript `array.push` +
+`array.shift` once the array is full, then `array.median`).
+
+Two heaps split the window into a lower and an upper half. Inserting and
+evicting cost O(log k) and the median is read from the heap tops in O(1).
+Evicted values are deleted lazily: they stay in their heap until they
+reach its top, and the heaps are rebuilt from the window once stale
+entries outnumber live ones, so memory stays O(k). Values are ordered by
+(value, insertion number), so equal values still have a well-defined side,
+which makes every eviction exact.
+
+The median is bit-identical to numpy.median over the same window: the
+middle value for odd sizes and (a + b) / 2 of the two middle values for
+even sizes.
+"""
+
+import heapq
+from collections import deque
+
+
+class RollingMedian:
+    """
+    Capped-window median with O(log k) updates
+    """
+
+    def __init__(self, capacity=None):
+        """
+        Initialize an empty window
+
+        Args:
+            capacity: Maximum number of values kept (None = unlimited); once
+                      full, each push evicts the oldest value
+        """
+        self.capacity = capacity
+        self._window = deque()
+        self._low = []    # max-heap of the lower half as (-value, -seq)
+        self._high = []   # min-heap of the upper half as (value, seq)
+        self._low_size = 0
+        self._high_size = 0
+        self._removed = set()
+        self._seq = 0
+
+    @classmethod
+    def from_values(cls, values, capacity=None):
+        """
+        Build a window holding `values` (oldest first), e.g. from values()
+
+        Args:
+            values: Iterable of numbers
+            capacity: Maximum number of values kept (only the newest are kept)
+
+        Returns:
+            RollingMedian
+        """
+        window = cls(capacity)
+        values = list(values)
+        if capacity is not None:
+            values = values[max(len(values) - capacity, 0):]
+        window._window.extend((value, seq) for seq, value in enumerate(values))
+        window._seq = len(values)
+        window._rebuild()
+        return window
+
+    def __len__(self):
+        return len(self._window)
+
+    def _prune(self):
+        """Drop evicted entries from the heap tops."""
+        low, high, removed = self._low, self._high, self._removed
+        while low and -low[0][1] in removed:
+            removed.discard(-heapq.heappop(low)[1])
+        while high and high[0][1] in removed:
+            removed.discard(heapq.heappop(high)[1])
+
+    def _in_low(self, value, seq):
+        """Check whether a live entry belongs to the lower half."""
+        if not self._low_size:
+            return False
+        top_value, top_seq = self._low[0]
+        return (value, seq) <= (-top_value, -top_seq)
+
+    def _rebalance(self):
+        """Keep the lower half equal in size to the upper half or one larger."""
+        while self._low_size > self._high_size + 1:
+            value, seq = heapq.heappop(self._low)
+            heapq.heappush(self._high, (-value, -seq))
+            self._low_size -= 1
+            self._high_size += 1
+            self._prune()
+        while self._low_size < self._high_size:
+            value, seq = heapq.heappop(self._high)
+            heapq.heappush(self._low, (-value, -seq))
+            self._high_size -= 1
+            self._low_size += 1
+            self._prune()
+
+    def push(self, value):
+        """
+        Add a value, evicting the oldest one if the window is full
+
+        Args:
+            value: Number to add (must not be NaN)
+        """
+        seq = self._seq
+        self._seq += 1
+
+        if self._in_low(value, seq):
+            heapq.heappush(self._low, (-value, -seq))
+            self._low_size += 1
+        else:
+            heapq.heappush(self._high, (value, seq))
+            self._high_size += 1
+        self._window.append((value, seq))
+
+        if self.capacity is not None and len(self._window) > self.capacity:
+            old_value, old_seq = self._window.popleft()
+            if self._in_low(old_value, old_seq):
+                self._low_size -= 1
+            else:
+                self._high_size -= 1
+            self._removed.add(old_seq)
+            self._prune()
+
+        self._rebalance()
+
+        if len(self._low) + len(self._high) > 2 * len(self._window) + 16:
+            self._rebuild()
+
+    def _rebuild(self):
+        """Rebuild both heaps from the live window (drops stale entries)."""
+        ordered = sorted(self._window)
+        half = (len(ordered) + 1) // 2
+        self._low = [(-value, -seq) for value, seq in ordered[:half]]
+        self._high = ordered[half:]
+        heapq.heapify(self._low)
+        heapq.heapify(self._high)
+        self._low_size = len(self._low)
+        self._high_size = len(self._high)
+        self._removed.clear()
+
+    def median(self, default=None):
+        """
+        Median of the current window
+
+        Args:
+            default: Value returned while the window is empty
+
+        Returns:
+            float: The median (bit-identical to numpy.median), or `default`
+        """
+        if not self._window:
+            return default
+        if self._low_size > self._high_size:
+            return -self._low[0][0]
+        return (-self._low[0][0] + self._high[0][0]) / 2
+
+    def values(self):
+        """Current window, oldest first."""
+        return [value for value, _ in self._window]
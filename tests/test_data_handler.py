@@ -0,0 +1,116 @@
+"""
+DataHandler tests
+=================
+
+Offline checks of the data layer on SyntheticProvider data.
+
+Run from the repository root: python -m pytest -q
+"""
+
+import time
+
+import pandas as pd
+
+from data import snapshots
+from data.data_handler import DataHandler, shared_manifest
+from data.memory_cache import FrameLRUCache
+from data.providers import LocalDirectoryProvider, SyntheticProvider
+
+
+def _handler(**kwargs):
+    return DataHandler(provider=kwargs.pop('provider', 'synthetic'), cache_dir='', store_dir='',
+                       memory_cache=FrameLRUCache(), **kwargs)
+
+
+def test_cached_universe_does_not_wait_for_rate_limit():
+    handler = _handler()
+    symbols = [f'SYM{i}' for i in range(20)]
+    for symbol in symbols:
+        handler.get_data(symbol, period='1y')
+
+    started = time.monotonic()
+    results = handler.fetch_universe(symbols, rate_limit=5, validate=False, period='1y')
+    assert time.monotonic() - started < 1.0
+    assert all(result.ok for result in results.values())
+
+
+def test_downloads_are_rate_limited():
+    handler = _handler()
+    symbols = [f'SYM{i}' for i in range(8)]
+
+    started = time.monotonic()
+    results = handler.fetch_universe(symbols, rate_limit=4, validate=False, period='1y')
+    # A burst of 4, then 4 more tokens at 4 per second
+    assert time.monotonic() - started >= 0.9
+    assert all(result.ok for result in results.values())
+
+
+class LimitedIntradayProvider(SyntheticProvider):
+    """Synthetic bars with yfinance-like intraday limits, recording requests"""
+
+    cacheable = True
+    intraday_limits = {'5m': (7, 59)}
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.requests = []
+
+    def download(self, symbols, period='2y', interval='1d', start_date=None, end_date=None):
+        self.requests.append((symbols, period, interval, start_date, end_date))
+        if interval in self.intraday_limits and start_date is None:
+            raise ValueError(f"{interval} data is limited to the last 60 days")
+        return super().download(symbols, period, interval, start_date, end_date)
+
+
+def test_intraday_history_backfills_before_cached_bars(tmp_path):
+    provider = LimitedIntradayProvider()
+    cached = DataHandler(provider=provider, cache_dir=str(tmp_path), store_dir='',
+                         memory_cache=FrameLRUCache())
+    cached.get_data('AAPL', period='5d', interval='5m')
+    longer = cached.get_data('AAPL', period='30d', interval='5m')
+
+    uncached = _handler(provider=LimitedIntradayProvider()).get_data('AAPL', period='30d',
+                                                                     interval='5m')
+    pd.testing.assert_frame_equal(longer, uncached)
+
+
+def test_get_many_assembles_intraday_history():
+    provider = LimitedIntradayProvider()
+    frames = _handler(provider=provider).get_many(['AAPL', 'MSFT'], period='30d', interval='5m')
+
+    expected = _handler(provider=LimitedIntradayProvider()).get_data('MSFT', period='30d',
+                                                                     interval='5m')
+    pd.testing.assert_frame_equal(frames['MSFT'], expected)
+    assert all(request[3] is not None for request in provider.requests)
+
+
+def test_memory_cache_keeps_provider_configurations_apart():
+    shared = FrameLRUCache()
+    first = DataHandler(provider=SyntheticProvider(seed=1), cache_dir='', store_dir='',
+                        memory_cache=shared).get_data('AAPL', period='1y')
+    second = DataHandler(provider=SyntheticProvider(seed=2), cache_dir='', store_dir='',
+                         memory_cache=shared).get_data('AAPL', period='1y')
+    assert not first.equals(second)
+
+    assert LocalDirectoryProvider('a').cache_namespace != LocalDirectoryProvider('b').cache_namespace
+    assert (LocalDirectoryProvider('a').cache_namespace !=
+            LocalDirectoryProvider('a', 'csv').cache_namespace)
+
+
+def test_snapshots_hash_once_and_record_full_frames(monkeypatch):
+    calls = []
+    real_hash = snapshots._hash
+    monkeypatch.setattr(snapshots, '_hash', lambda data: calls.append(1) or real_hash(data))
+
+    handler = _handler()
+    full = handler.get_data('SNAP', period='max')
+    assert len(calls) == 1
+
+    frames = handler.get_timeframes('SNAP', {'1d': 'max', '1wk': 'max'})
+    assert len(calls) == 2  # the weekly frame only
+
+    manifest = shared_manifest()
+    handler.get_timeframes('SNAP', {'1d': 'max', '1wk': 'max'}, columns=('Close',))
+    _handler(compact=True).get_data('SNAP', period='max')
+    assert manifest.matches('SNAP', '1d', full)
+    assert manifest.matches('SNAP', '1wk', frames['1wk'])
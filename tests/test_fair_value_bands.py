@@ -0,0 +1,239 @@
+"""
+Fair Value Bands equivalence tests
+==================================
+
+The vectorized kernel, the boost sweep and the streaming state all claim
+to reproduce the original PineScript port bit for bit. These tests keep a
+frozen copy of that per-bar loop and compare against it on offline
+SyntheticProvider data. The module needs pandas_ta (the fair value
+smoothing) and is skipped without it.
+
+Run from the repository root: python -m pytest -q
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('pandas_ta')
+
+from data.data_handler import DataHandler
+from data.memory_cache import FrameLRUCache
+from indicators.fair_value_bands import (calculate_fair_value_bands, calculate_smoothed_value,
+                                         fair_value_bands_kernel, fair_value_bands_sweep,
+                                         get_source, point_in_time_fair_value_bands)
+from indicators.fair_value_bands_state import BAND_COLUMNS, FairValueBandsState
+
+
+def reference_bands(df, fair_price_smooth, threshold_up_str='Low', threshold_down_str='High',
+                    threshold_boost=1.0, deviation_boost=1.0, trend_mode='Cross'):
+    """
+    Frozen copy of the original per-bar loop of calculate_fair_value_bands
+
+    Do not optimize: this is the specification the kernel is checked against.
+    """
+    threshold_up_src = get_source(df, threshold_up_str)
+    threshold_down_src = get_source(df, threshold_down_str)
+    result = pd.DataFrame(index=df.index)
+
+    low_spread = df['Low'] / fair_price_smooth
+    high_spread = df['High'] / fair_price_smooth
+    ohlc4 = (df['Open'] + df['High'] + df['Low'] + df['Close']) / 4
+    ohlc_spread = ohlc4 / fair_price_smooth
+
+    deviation_up_list = []
+    deviation_down_list = []
+    pivot_ups_array = []
+    pivot_downs_array = []
+
+    threshold_upper_values = []
+    threshold_lower_values = []
+    median_pivot_up_values = []
+    median_pivot_down_values = []
+    dir_switch_values = [0]
+
+    for i in range(len(df)):
+        if pd.notna(fair_price_smooth.iloc[i]):
+            if df['Low'].iloc[i] < fair_price_smooth.iloc[i] and df['High'].iloc[i] > fair_price_smooth.iloc[i]:
+                deviation_up_list.append(high_spread.iloc[i])
+                deviation_down_list.append(low_spread.iloc[i])
+                if len(deviation_up_list) > 1000:
+                    deviation_up_list.pop(0)
+                if len(deviation_down_list) > 1000:
+                    deviation_down_list.pop(0)
+
+        median_up_dev = np.median(deviation_up_list) if len(deviation_up_list) > 0 else 1.0
+        median_down_dev = np.median(deviation_down_list) if len(deviation_down_list) > 0 else 1.0
+
+        upper_band = fair_price_smooth.iloc[i] * median_up_dev
+        lower_band = fair_price_smooth.iloc[i] * median_down_dev
+
+        band_up_spread = upper_band - fair_price_smooth.iloc[i]
+        band_down_spread = fair_price_smooth.iloc[i] - lower_band
+
+        upper_band_boosted = fair_price_smooth.iloc[i] + (band_up_spread * threshold_boost)
+        lower_band_boosted = fair_price_smooth.iloc[i] - (band_down_spread * threshold_boost)
+
+        threshold_upper_values.append(upper_band_boosted)
+        threshold_lower_values.append(lower_band_boosted)
+
+        if i >= 5 and i < len(df) - 5:
+            is_pivot_high = all(ohlc_spread.iloc[i] >= ohlc_spread.iloc[i-j] for j in range(1, 6)) and \
+                            all(ohlc_spread.iloc[i] >= ohlc_spread.iloc[i+j] for j in range(1, 6))
+            is_pivot_low = all(ohlc_spread.iloc[i] <= ohlc_spread.iloc[i-j] for j in range(1, 6)) and \
+                           all(ohlc_spread.iloc[i] <= ohlc_spread.iloc[i+j] for j in range(1, 6))
+
+            if is_pivot_high and not pd.isna(ohlc_spread.iloc[i]):
+                if df['Low'].iloc[i] > upper_band_boosted:
+                    pivot_ups_array.append(ohlc_spread.iloc[i])
+                    if len(pivot_ups_array) > 2000:
+                        pivot_ups_array.pop(0)
+
+            if is_pivot_low and not pd.isna(ohlc_spread.iloc[i]):
+                if df['High'].iloc[i] < lower_band_boosted:
+                    pivot_downs_array.append(ohlc_spread.iloc[i])
+                    if len(pivot_downs_array) > 2000:
+                        pivot_downs_array.pop(0)
+
+        median_pivot_up = np.median(pivot_ups_array) if len(pivot_ups_array) > 0 else 1.02
+        median_pivot_down = np.median(pivot_downs_array) if len(pivot_downs_array) > 0 else 0.98
+
+        median_pivot_up_values.append(median_pivot_up)
+        median_pivot_down_values.append(median_pivot_down)
+
+        if i > 0:
+            if trend_mode == 'Cross':
+                trend_rule_up = threshold_up_src.iloc[i] > upper_band_boosted
+                trend_rule_down = threshold_down_src.iloc[i] < lower_band_boosted
+            else:
+                trend_rule_up = fair_price_smooth.iloc[i] > fair_price_smooth.iloc[i-1]
+                trend_rule_down = fair_price_smooth.iloc[i] < fair_price_smooth.iloc[i-1]
+
+            if trend_rule_down:
+                dir_switch_values.append(-1)
+            elif trend_rule_up:
+                dir_switch_values.append(1)
+            else:
+                dir_switch_values.append(dir_switch_values[-1])
+
+    result['threshold_upper'] = threshold_upper_values
+    result['threshold_lower'] = threshold_lower_values
+    result['trend_direction'] = dir_switch_values
+
+    median_pivot_up_series = pd.Series(median_pivot_up_values, index=df.index)
+    median_pivot_down_series = pd.Series(median_pivot_down_values, index=df.index)
+
+    pivot_band_up_base = fair_price_smooth * median_pivot_up_series
+    pivot_band_down_base = fair_price_smooth * median_pivot_down_series
+
+    p_band_up_spread = (pivot_band_up_base - fair_price_smooth) * deviation_boost
+    p_band_down_spread = (fair_price_smooth - pivot_band_down_base) * deviation_boost
+
+    result['deviation_upper_1x'] = fair_price_smooth + p_band_up_spread
+    result['deviation_lower_1x'] = fair_price_smooth - p_band_down_spread
+    result['deviation_upper_2x'] = result['deviation_upper_1x'] + p_band_up_spread
+    result['deviation_lower_2x'] = result['deviation_lower_1x'] - p_band_down_spread
+
+    return result
+
+
+KERNEL_CASES = [
+    {},
+    {'trend_mode': 'Direction'},
+    {'threshold_boost': 1.7, 'deviation_boost': 0.825},
+    {'threshold_up_str': 'Close', 'threshold_down_str': 'Close', 'threshold_boost': 0.3},
+]
+
+
+@pytest.fixture(scope='module')
+def handler():
+    return DataHandler(provider='synthetic', cache_dir='', store_dir='',
+                       memory_cache=FrameLRUCache())
+
+
+@pytest.fixture(scope='module', params=['AAPL', 'TQQQ'])
+def timeframes(handler, request):
+    return handler.get_timeframes(request.param, {'1d': 'max', '1wk': 'max'})
+
+
+@pytest.fixture(scope='module')
+def daily(timeframes):
+    return timeframes['1d']
+
+
+@pytest.mark.parametrize('params', KERNEL_CASES)
+@pytest.mark.parametrize('smoothing_type', ['SMA', 'Median'])
+def test_kernel_matches_reference_loop(timeframes, params, smoothing_type):
+    daily = timeframes['1d']
+    for df in [daily.iloc[-3000:], daily.iloc[:300], daily.iloc[:60], timeframes['1wk']]:
+        fair = calculate_smoothed_value(get_source(df, 'OHLC4'), 33, smoothing_type, df)
+        expected = reference_bands(df, fair, **params)
+
+        bands = fair_value_bands_kernel(
+            fair.to_numpy(np.float64), df['Open'].to_numpy(np.float64),
+            df['High'].to_numpy(np.float64), df['Low'].to_numpy(np.float64),
+            df['Close'].to_numpy(np.float64),
+            get_source(df, params.get('threshold_up_str', 'Low')).to_numpy(np.float64),
+            get_source(df, params.get('threshold_down_str', 'High')).to_numpy(np.float64),
+            **{key: value for key, value in params.items() if not key.endswith('_str')}
+        )
+        for column in expected.columns:
+            np.testing.assert_array_equal(bands[column], expected[column].to_numpy(), err_msg=column)
+
+        result = calculate_fair_value_bands(df, smoothing_type=smoothing_type, **params)
+        pd.testing.assert_frame_equal(result[expected.columns], expected, check_exact=True,
+                                      check_names=False)
+        pd.testing.assert_series_equal(result['fair_value'], fair, check_names=False,
+                                       check_exact=True)
+
+
+@pytest.mark.parametrize('smoothing_type', ['SMA_exact', 'Median'])
+@pytest.mark.parametrize('params', KERNEL_CASES[:2])
+def test_stream_matches_causal_batch(daily, smoothing_type, params):
+    df = daily.iloc[-1500:]
+    batch = calculate_fair_value_bands(df, smoothing_type=smoothing_type,
+                                       pivot_mode='causal', **params)
+
+    state = FairValueBandsState(smoothing_type=smoothing_type, **params)
+    streamed = pd.DataFrame(state.update_many(df), index=df.index)
+
+    for column in BAND_COLUMNS:
+        np.testing.assert_array_equal(streamed[column].to_numpy(np.float64),
+                                      batch[column].to_numpy(np.float64), err_msg=column)
+
+    # The latest streamed row is also the last row of a centered run
+    centered = calculate_fair_value_bands(df, smoothing_type=smoothing_type, **params)
+    np.testing.assert_array_equal(streamed[BAND_COLUMNS].iloc[-1].to_numpy(np.float64),
+                                  centered[BAND_COLUMNS].iloc[-1].to_numpy(np.float64))
+
+
+def test_point_in_time_rows_match_truncated_runs(daily):
+    df = daily.iloc[-400:]
+    point_in_time = point_in_time_fair_value_bands(df, smoothing_type='SMA_exact')
+
+    for end in [50, 120, 260, len(df)]:
+        truncated = calculate_fair_value_bands(df.iloc[:end], smoothing_type='SMA_exact')
+        np.testing.assert_array_equal(point_in_time[BAND_COLUMNS].iloc[end - 1].to_numpy(np.float64),
+                                      truncated[BAND_COLUMNS].iloc[-1].to_numpy(np.float64))
+
+
+@pytest.mark.parametrize('pivot_mode', ['centered', 'causal'])
+def test_sweep_slices_match_single_runs(daily, pivot_mode):
+    df = daily.iloc[-2000:]
+    threshold_boosts = (0.5, 1.0, 1.7)
+    deviation_boosts = (0.825, 1.0, 2.0)
+    sweep = fair_value_bands_sweep(df, threshold_boosts, deviation_boosts, pivot_mode=pivot_mode)
+
+    for t, threshold_boost in enumerate(threshold_boosts):
+        for d, deviation_boost in enumerate(deviation_boosts):
+            single = calculate_fair_value_bands(df, threshold_boost=threshold_boost,
+                                                deviation_boost=deviation_boost,
+                                                pivot_mode=pivot_mode)
+            np.testing.assert_array_equal(sweep['fair_value'], single['fair_value'].to_numpy())
+            for column in ['threshold_upper', 'threshold_lower']:
+                np.testing.assert_array_equal(sweep[column][t], single[column].to_numpy(),
+                                              err_msg=column)
+            for column in ['deviation_upper_1x', 'deviation_lower_1x',
+                           'deviation_upper_2x', 'deviation_lower_2x']:
+                np.testing.assert_array_equal(sweep[column][t, d], single[column].to_numpy(),
+                                              err_msg=column)
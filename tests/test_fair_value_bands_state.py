@@ -0,0 +1,58 @@
+"""
+Streaming Fair Value Bands checkpoint tests
+===========================================
+
+Run from the repository root: python -m pytest -q
+"""
+
+import pytest
+
+pytest.importorskip('pandas_ta')
+
+from data.data_handler import DataHandler
+from data.memory_cache import FrameLRUCache
+from indicators.fair_value_bands_state import FairValueBandsState
+
+
+@pytest.fixture(scope='module')
+def daily():
+    handler = DataHandler(provider='synthetic', cache_dir='', store_dir='',
+                          memory_cache=FrameLRUCache())
+    return handler.get_data('AAPL', period='max')
+
+
+def _snapshot(state):
+    """Everything a state carries from bar to bar."""
+    return (state.bars, state.last_index, state.last_bar, state.trend_direction,
+            state.last_fair_value, list(state.smoothing), list(state.pivot_buffer),
+            state.up_deviations.values(), state.down_deviations.values(),
+            state.pivots_up.values(), state.pivots_down.values())
+
+
+@pytest.mark.parametrize('smoothing_type', ['SMA_exact', 'Median'])
+def test_resume_matches_uninterrupted_run(tmp_path, daily, smoothing_type):
+    path = str(tmp_path / 'AAPL.npz')
+    FairValueBandsState.from_history(daily.iloc[:-150], smoothing_type=smoothing_type).save(path)
+
+    resumed = FairValueBandsState.resume(path, daily.iloc[-300:], smoothing_type=smoothing_type)
+    uninterrupted = FairValueBandsState.from_history(daily, smoothing_type=smoothing_type)
+    assert _snapshot(resumed) == _snapshot(uninterrupted)
+
+    # The saved checkpoint continues the same way
+    reloaded = FairValueBandsState.load(path)
+    assert _snapshot(reloaded) == _snapshot(uninterrupted)
+
+
+def test_resume_with_new_params_rebuilds_from_history(tmp_path, daily, capsys):
+    path = str(tmp_path / 'AAPL.npz')
+    FairValueBandsState.from_history(daily.iloc[:-150], smoothing_type='SMA_exact').save(path)
+
+    window = daily.iloc[-200:]
+    rebuilt = FairValueBandsState.resume(path, window, history=lambda: daily.iloc[:-20],
+                                         smoothing_type='Median')
+    assert 'parameters changed' in capsys.readouterr().out
+    assert _snapshot(rebuilt) == _snapshot(
+        FairValueBandsState.from_history(daily, smoothing_type='Median'))
+
+    FairValueBandsState.resume(path, window, smoothing_type='SMA_exact')
+    assert 'from the 200 bars given' in capsys.readouterr().out
@@ -0,0 +1,19 @@
+"""
+Market calendar tests
+=====================
+
+Run from the repository root: python -m pytest -q
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data.market_calendar import last_sessions
+
+
+@pytest.mark.parametrize('unit', ['s', 'ms', 'us', 'ns'])
+def test_last_sessions_ignores_index_resolution(unit):
+    period_ends = pd.DatetimeIndex(np.array(['2026-01-31', '2026-07-04'], dtype=f'datetime64[{unit}]'))
+    expected = pd.DatetimeIndex(['2026-01-30', '2026-07-02'])
+    assert list(last_sessions(period_ends)) == list(expected)
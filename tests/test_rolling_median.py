@@ -0,0 +1,29 @@
+"""
+Rolling median tests
+====================
+
+Run from the repository root: python -m pytest -q
+"""
+
+import numpy as np
+import pytest
+
+from indicators.rolling_median import RollingMedian
+
+
+@pytest.mark.parametrize('capacity', [None, 1, 2, 7, 1000])
+def test_rolling_median_matches_numpy(capacity):
+    rng = np.random.default_rng(7)
+    # Rounded values give many ties, which exercises the eviction order
+    values = np.round(rng.normal(size=3000), 1)
+
+    window = RollingMedian(capacity)
+    assert window.median(1.0) == 1.0
+    for i, value in enumerate(values):
+        window.push(value)
+        first = 0 if capacity is None else max(i + 1 - capacity, 0)
+        assert window.median() == np.median(values[first:i + 1])
+
+    restored = RollingMedian.from_values(window.values(), capacity)
+    assert restored.values() == window.values()
+    assert restored.median() == window.median()
@@ -17,7 +17,8 @@ import warnings
 warnings.filterwarnings('ignore')
 
 from data.data_handler import DataHandler
-from indicators.fair_value_bands import calculate_fair_value_bands, FAIR_VALUE_PARAMS
+from indicators.fair_value_bands import (calculate_fair_value_bands, fair_value_bands_columns,
+                                         FAIR_VALUE_PARAMS)
 
 
 def create_weekly_bands_chart(symbol='AAPL', period='10y'):
@@ -31,7 +32,8 @@ def create_weekly_bands_chart(symbol='AAPL', period='10y'):
     
     # Load data
     dh = DataHandler()
-    weekly = dh.get_data(symbol, period=period, interval='1wk')
+    weekly = dh.get_data(symbol, period=period, interval='1wk',
+                         columns=fair_value_bands_columns(**FAIR_VALUE_PARAMS))
     print(f"✓ Loaded {len(weekly)} weekly bars")
     
     # Calculate Fair Value Bands